@@ -1,8 +1,10 @@
 """
-Migrate credentials from oauth.json to DynamoDB
+Migrate credentials from the OAuth store to DynamoDB
 
 This script safely migrates all stored credentials from the plaintext
-oauth.json file to encrypted DynamoDB storage.
+local OAuth store (my_app/server/oauth.db, or the S3 document when
+OAUTH_S3_BUCKET is set) to encrypted DynamoDB storage. A leftover
+oauth.json is not read: it was imported into oauth.db once and is stale.
 
 Usage:
     uv run python migrate_credentials_to_dynamodb.py
@@ -14,20 +16,21 @@ Prerequisites:
 """
 
 from tests.dynamodb_credential_manager import DynamoDBCredentialManager
-import json
-from pathlib import Path
+import sqlite3
 from datetime import datetime
+from my_app.server.oauth_store import DB_PATH, get_oauth_store
+from my_app.server.salesforce_utils import _use_s3, load_oauth_data
 
 
 def migrate_oauth_to_dynamodb(dry_run=True):
     """
-    Migrate oauth.json credentials to DynamoDB
+    Migrate OAuth store credentials to DynamoDB
     
     Args:
         dry_run: If True, only shows what would be migrated without writing
     """
     print("=" * 60)
-    print("SECURIVA Credential Migration: oauth.json → DynamoDB")
+    print("SECURIVA Credential Migration: OAuth store → DynamoDB")
     print("=" * 60)
     
     if dry_run:
@@ -47,20 +50,13 @@ def migrate_oauth_to_dynamodb(dry_run=True):
         print("  3. Verify MASTER_ENCRYPTION_KEY is set")
         return False
     
-    # Load existing oauth.json
-    oauth_path = Path(__file__).parent / "my_app/server/oauth.json"
-    
-    if not oauth_path.exists():
-        print(f"❌ oauth.json not found at {oauth_path}")
-        print("   Nothing to migrate.")
-        return False
-    
-    with open(oauth_path, "r") as f:
-        oauth_data = json.load(f)
+    # Load current credentials through the same path the app uses
+    oauth_data = load_oauth_data()
     
     users = oauth_data.get("users", [])
     if not users:
-        print("⚠️  No users found in oauth.json")
+        print("⚠️  No users found in the OAuth store")
+        print("   Nothing to migrate.")
         return False
     
     print(f"\n📋 Found {len(users)} user(s) to migrate:\n")
@@ -160,17 +156,23 @@ def migrate_oauth_to_dynamodb(dry_run=True):
         print("✅ MIGRATION COMPLETE")
         print(f"\nSuccessfully migrated {migration_count} credential set(s)")
         
-        # Create backup
-        backup_path = oauth_path.with_suffix('.json.backup')
-        import shutil
-        shutil.copy(oauth_path, backup_path)
-        print(f"\n📋 Backup created: {backup_path}")
+        # Create backup (a consistent copy, even while the app is writing)
+        if _use_s3():
+            print("\n📋 S3 store: rely on bucket versioning for a backup")
+        else:
+            backup_path = DB_PATH.with_name(DB_PATH.name + ".backup")
+            backup = sqlite3.connect(backup_path)
+            try:
+                get_oauth_store().conn.backup(backup)
+            finally:
+                backup.close()
+            print(f"\n📋 Backup created: {backup_path}")
         
         print("\n⚠️  NEXT STEPS:")
         print("  1. Test your application with DynamoDB credentials")
         print("  2. Verify Salesforce integration still works")
-        print("  3. Once confirmed, securely delete oauth.json:")
-        print(f"     rm {oauth_path}")
+        print("  3. Once confirmed, securely delete the local OAuth store:")
+        print(f"     rm {DB_PATH}* {DB_PATH.with_name('oauth.json')}")
         print("  4. Update your application code to use DynamoDB")
     
     print("=" * 60)
@@ -17,6 +17,16 @@ from datetime import datetime
 from typing import Optional
 
 
+# API key -> user_id cache so repeat requests skip the oauth data lookup.
+# Cleared for a user whenever their key is stored or revoked; last_used is
+# only written on a miss, so it is accurate to within API_KEY_CACHE_TTL.
+API_KEY_CACHE_TTL = 60  # seconds
+API_KEY_CACHE_MAX = 10_000
+_api_key_cache: dict[bytes, tuple[str, float]] = {}
+# Per-process key so cache keys are a MAC of the cookie, never the key itself
+_API_KEY_DIGEST_KEY = secrets.token_bytes(32)
+
+
 def generate_api_key() -> str:
     """
     Generate a new API key with format: sk_live_<random>
@@ -69,7 +79,7 @@ def validate_api_key(api_key: str) -> Optional[str]:
     Returns:
         Optional[str]: user_id if valid, None if invalid
     """
-    from .salesforce_utils import load_oauth_data, save_oauth_data
+    from .salesforce_utils import load_oauth_data, get_user_by_key_hash, save_oauth_user
 
     t0 = time.perf_counter()
 
@@ -81,21 +91,62 @@ def validate_api_key(api_key: str) -> Optional[str]:
     data = load_oauth_data()
     t2 = time.perf_counter()
 
-    # Search for matching hash
-    users = data.get("users", [])
-    for user in users:
-        api_key_data = user.get("api_key")
-        if api_key_data and api_key_data.get("key_hash") == key_hash:
-            # Update last_used timestamp
-            api_key_data["last_used"] = datetime.now().isoformat()
-            save_oauth_data(data)
-            t3 = time.perf_counter()
-            print(f"\u23f1\ufe0f  [AUTH]   validate_key: hash={(.0 if not t1 else (t1-t0)*1000):.0f}ms | read={((t2-t1)*1000):.0f}ms | write={((t3-t2)*1000):.0f}ms | total={((t3-t0)*1000):.0f}ms")
-            return user.get("user_id")
+    # Look up the matching hash
+    user = get_user_by_key_hash(key_hash, data)
+    if user:
+        # Update last_used timestamp
+        user["api_key"]["last_used"] = datetime.now().isoformat()
+        save_oauth_user(data, user)
+        t3 = time.perf_counter()
+        print(f"\u23f1\ufe0f  [AUTH]   validate_key: hash={(.0 if not t1 else (t1-t0)*1000):.0f}ms | read={((t2-t1)*1000):.0f}ms | write={((t3-t2)*1000):.0f}ms | total={((t3-t0)*1000):.0f}ms")
+        return user.get("user_id")
 
     return None
 
 
+def _api_key_digest(api_key: str) -> bytes:
+    return hashlib.blake2b(api_key.encode(), digest_size=16, key=_API_KEY_DIGEST_KEY).digest()
+
+
+def validate_api_key_cached(api_key: str) -> Optional[str]:
+    """
+    validate_api_key with a short TTL cache keyed by the key's digest
+
+    Args:
+        api_key: Plaintext API key from request
+
+    Returns:
+        Optional[str]: user_id if valid, None if invalid
+    """
+    digest = _api_key_digest(api_key)
+    now = time.monotonic()
+    cached = _api_key_cache.get(digest)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    user_id = validate_api_key(api_key)
+    if user_id:
+        if len(_api_key_cache) >= API_KEY_CACHE_MAX:
+            for k in [k for k, (_, exp) in _api_key_cache.items() if exp <= now]:
+                del _api_key_cache[k]
+            if len(_api_key_cache) >= API_KEY_CACHE_MAX:
+                _api_key_cache.clear()
+        _api_key_cache[digest] = (user_id, now + API_KEY_CACHE_TTL)
+    return user_id
+
+
+def invalidate_api_key_cache(user_id: str) -> None:
+    """
+    Drop cached validations for a user's API key, so a replaced or revoked
+    key is rejected on its next use
+
+    Args:
+        user_id: User's unique identifier
+    """
+    for digest in [k for k, (cached_user, _) in list(_api_key_cache.items()) if cached_user == user_id]:
+        _api_key_cache.pop(digest, None)
+
+
 def update_last_used(user_id: str) -> None:
     """
     Update the last_used timestamp for a user's API key
@@ -141,6 +192,7 @@ def store_api_key(user_id: str, api_key: str) -> None:
             break
 
     save_oauth_data(data)
+    invalidate_api_key_cache(user_id)
 
 
 def revoke_api_key(user_id: str) -> bool:
@@ -162,6 +214,7 @@ def revoke_api_key(user_id: str) -> bool:
         if user.get("user_id") == user_id:
             user["api_key"] = None
             save_oauth_data(data)
+            invalidate_api_key_cache(user_id)
             return True
 
     return False
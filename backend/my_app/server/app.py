@@ -19,7 +19,7 @@ from .api_key_manager import generate_api_key, store_api_key, validate_api_key
 from .salesforce_utils import load_oauth_data, save_oauth_data
 from .telesign_auth import (
     send_whatsapp_message,
-    send_sms,
+    send_sms_async,
     verify_phone_number,
     get_message_status,
     send_verification_code,
@@ -310,7 +310,7 @@ async def api_send_sms(request):
             )
         
         phone = phone.lstrip('+')
-        result = send_sms(phone, message)
+        result = await send_sms_async(phone, message)
         return JSONResponse(result)
     except Exception as e:
         return JSONResponse(
@@ -80,9 +80,10 @@ class CredentialEncryptionService:
         Raises:
             ValueError: If decryption fails (wrong key or tampered data)
         """
-        # Extract nonce (first 12 bytes)
-        nonce = encrypted_data[:12]
-        ciphertext = encrypted_data[12:]
+        # Extract nonce (first 12 bytes); memoryview slices avoid copying the blob
+        view = memoryview(encrypted_data)
+        nonce = view[:12]
+        ciphertext = view[12:]
         
         # Decrypt (also verifies authentication tag)
         try:
@@ -93,6 +94,14 @@ class CredentialEncryptionService:
         # Deserialize JSON
         return json.loads(plaintext.decode('utf-8'))
     
+    @classmethod
+    def _with_key(cls, key: bytes) -> "CredentialEncryptionService":
+        """Build a service around an already-derived key (skips env lookup and PBKDF2)"""
+        service = cls.__new__(cls)
+        service.key = key
+        service.aesgcm = AESGCM(key)
+        return service
+    
     def rotate_encryption(self, old_encrypted_data: bytes, old_master_key: str) -> bytes:
         """
         Re-encrypt data with new master key (for key rotation)
@@ -105,9 +114,7 @@ class CredentialEncryptionService:
             bytes: Data encrypted with new key
         """
         # Create temporary service with old key
-        old_service = CredentialEncryptionService()
-        old_service.key = self._derive_key(old_master_key.encode())
-        old_service.aesgcm = AESGCM(old_service.key)
+        old_service = self._with_key(self._derive_key(old_master_key.encode()))
         
         # Decrypt with old key
         credentials = old_service.decrypt_credentials(old_encrypted_data)
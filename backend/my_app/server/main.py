@@ -1,4 +1,7 @@
 import contextlib
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from starlette.applications import Starlette
 from starlette.routing import Mount
 from starlette.middleware.cors import CORSMiddleware
@@ -8,15 +11,47 @@ from .mcp_server import mcp
 from ..auth_server.main import auth_app
 from .vapi_webhook import vapi_app
 from .mcp_pool import mcp_pool
+from .salesforce_app import start_refresh_task, stop_refresh_task, close_http_client
+from .telesign_auth import start_otp_workers, stop_otp_workers
 from ..config.settings import settings
 
 
+@contextlib.contextmanager
+def queued_root_logging():
+    """
+    Move the root logger's handlers onto a listener thread while the app runs,
+    so request handlers and background refresh workers only enqueue records.
+    """
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    try:
+        yield
+    finally:
+        root.removeHandler(queue_handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        listener.stop()
+
+
 @contextlib.asynccontextmanager
 async def lifespan(app: Starlette):
     async with contextlib.AsyncExitStack() as stack:
+        stack.enter_context(queued_root_logging())
         await stack.enter_async_context(mcp.session_manager.run())
         mcp_pool.start_cleanup_task()
+        start_refresh_task()
+        start_otp_workers()
         yield
+        await stop_otp_workers()
+        await stop_refresh_task()
+        await close_http_client()
         await mcp_pool.close_all()
 
 
@@ -109,7 +109,7 @@ def getGoogleCreds(ctx) -> Credentials:
                 print(f"⏱️  [MCP-TOOL] getGoogleCreds: {((time.time()-t0)*1000):.0f}ms")
                 return creds
 
-        print(f"⚠️  [MCP-TOOL] getGoogleCreds: No user found in oauth.json for user_id={user_id}")
+        print(f"⚠️  [MCP-TOOL] getGoogleCreds: No user found in the OAuth store for user_id={user_id}")
         return None
 
     except Exception as e:
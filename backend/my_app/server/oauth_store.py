@@ -0,0 +1,107 @@
+"""
+SQLite-backed storage for per-user OAuth data (local backend)
+
+Each user entry from the old oauth.json layout is stored as one row, so
+updating one user's tokens rewrites that row instead of the whole file.
+An existing oauth.json is imported the first time the database is created.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DB_PATH = Path(__file__).parent / "oauth.db"
+LEGACY_JSON_PATH = Path(__file__).parent / "oauth.json"
+
+log = logging.getLogger(__name__)
+
+
+class SQLiteOAuthStore:
+    def __init__(self, db_path=DB_PATH, legacy_json_path=LEGACY_JSON_PATH):
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.Lock()
+        self._init_db()
+        self._migrate_json(Path(legacy_json_path))
+
+    def _init_db(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                user_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            )
+        """)
+
+    def _migrate_json(self, path: Path):
+        """Import users from oauth.json if the table is still empty"""
+        if not path.exists():
+            return
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+                return
+            with open(path, "r") as f:
+                users = json.load(f).get("users", [])
+            self._write_users(users)
+        log.info("[OAUTH_STORE] Imported %d users from %s", len(users), path.name)
+
+    def _write_users(self, users: List[Dict], replace: bool = False):
+        """Insert or replace users in one transaction; with replace, also delete every other row"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if replace:
+                keep = {u["user_id"] for u in users}
+                stale = [
+                    (user_id,) for (user_id,) in self.conn.execute("SELECT user_id FROM users")
+                    if user_id not in keep
+                ]
+                self.conn.executemany("DELETE FROM users WHERE user_id = ?", stale)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO users (user_id, data) VALUES (?, ?)",
+                [(u["user_id"], json.dumps(u, separators=(",", ":"))) for u in users]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database"""
+        with self._lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_user(self, user_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT data FROM users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_users(self) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute("SELECT data FROM users").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def upsert_user(self, user: Dict):
+        """Insert or replace a single user entry"""
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO users (user_id, data) VALUES (?, ?)",
+                (user["user_id"], json.dumps(user, separators=(",", ":")))
+            )
+
+    def replace_users(self, users: List[Dict]):
+        """Make the table hold exactly these user entries, in one transaction"""
+        with self._lock:
+            self._write_users(users, replace=True)
+
+
+_store = None
+
+
+def get_oauth_store() -> SQLiteOAuthStore:
+    global _store
+    if _store is None:
+        _store = SQLiteOAuthStore()
+    return _store
@@ -1,14 +1,21 @@
 from starlette.applications import Starlette
 from starlette.routing import Route
 from starlette.responses import RedirectResponse, JSONResponse
-import requests
+import asyncio
+import time
+import httpx
 import os
-import json
-from pathlib import Path
-from urllib.parse import urlencode, parse_qs
+from urllib.parse import urlencode, quote
+import logging
 from datetime import datetime
-from .api_key_manager import validate_api_key
-from .salesforce_utils import load_oauth_data, save_oauth_data
+from .api_key_manager import validate_api_key_cached
+from .salesforce_utils import (
+    get_user,
+    load_oauth_data,
+    save_oauth_user,
+    refresh_salesforce_token_async,
+    should_refresh_token,
+)
 
 
 # Environment variables
@@ -18,6 +25,130 @@ SF_CALLBACK_URL = os.getenv("SF_CALLBACK_URL")
 SF_DOMAIN = os.getenv("SF_DOMAIN", "login")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 
+log = logging.getLogger(__name__)
+
+# Authorize URL with the static params; only state varies per login
+_AUTHORIZE_URL = f"https://{SF_DOMAIN}.salesforce.com/services/oauth2/authorize?" + urlencode({
+    "response_type": "code",
+    "client_id": SF_CLIENT_ID,
+    "redirect_uri": SF_CALLBACK_URL,
+    "scope": "api refresh_token offline_access",
+})
+
+# Background token refresh: scan every minute, refresh tokens that will
+# cross the 90-minute staleness threshold within the next 5 minutes
+REFRESH_INTERVAL = 60  # seconds
+REFRESH_LEAD_MS = 300_000  # 5 minutes
+REFRESH_CONCURRENCY = 8
+# After a failed refresh (e.g. invalid_grant) the user is skipped for
+# REFRESH_INTERVAL, doubling per consecutive failure up to this cap, until
+# they log in again and get a new refresh token
+REFRESH_BACKOFF_MAX = 6 * 3600  # seconds
+
+_refresh_task: asyncio.Task | None = None
+# user_id -> (refresh_token that failed, consecutive failures, retry after (monotonic))
+_refresh_failures: dict[str, tuple[str, int, float]] = {}
+
+# Shared client for the OAuth token exchange so the callback doesn't block the event loop
+_sf_client = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+)
+
+
+def _due_for_refresh(issued_at) -> bool:
+    """Check if a token will be stale within REFRESH_LEAD_MS."""
+    try:
+        issued_at = int(issued_at) - REFRESH_LEAD_MS
+    except (ValueError, TypeError):
+        issued_at = None
+    return should_refresh_token(issued_at)
+
+
+def _users_due_for_refresh(data, now: float) -> list:
+    """(user_id, refresh_token) for users whose token is due and who aren't backing off after a failure"""
+    due = []
+    for user in data.get("users", []):
+        sf_service = (user.get("services") or {}).get("salesforce") or {}
+        sf_creds = sf_service.get("credentials")
+        if not sf_creds or "refresh_token" not in sf_creds:
+            continue
+        if not _due_for_refresh(sf_creds.get("issued_at")):
+            continue
+        refresh_token = sf_creds["refresh_token"]
+        failed = _refresh_failures.get(user["user_id"])
+        if failed and failed[0] == refresh_token and now < failed[2]:
+            continue
+        due.append((user["user_id"], refresh_token))
+    return due
+
+
+def _record_refresh_result(user_id: str, refresh_token: str, ok: bool, now: float):
+    """Clear a user's backoff after a successful refresh, or extend it after a failure"""
+    if ok:
+        _refresh_failures.pop(user_id, None)
+        return
+    failed = _refresh_failures.get(user_id)
+    # A new refresh token means the user logged in again; start over
+    failures = failed[1] + 1 if failed and failed[0] == refresh_token else 1
+    delay = min(REFRESH_INTERVAL * 2 ** (failures - 1), REFRESH_BACKOFF_MAX)
+    _refresh_failures[user_id] = (refresh_token, failures, now + delay)
+    log.warning(
+        "[SALESFORCE] Token refresh failed %d time(s) for user %s; retrying in %ds",
+        failures, user_id, delay,
+    )
+
+
+async def _refresh_loop():
+    """
+    Proactively refresh Salesforce tokens off the request path.
+
+    get_fresh_salesforce_credentials() still refreshes inline as a fallback
+    (clock skew, missed tick, server just started).
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL)
+        try:
+            data = await loop.run_in_executor(None, load_oauth_data)
+            stale = _users_due_for_refresh(data, time.monotonic())
+
+            # Refresh concurrently (bounded) so a batch after restart costs ~one round trip
+            sem = asyncio.Semaphore(REFRESH_CONCURRENCY)
+
+            async def _refresh_one(user_id, refresh_token):
+                async with sem:
+                    sf_creds = await refresh_salesforce_token_async(user_id)
+                _record_refresh_result(user_id, refresh_token, bool(sf_creds), time.monotonic())
+
+            await asyncio.gather(*(_refresh_one(*due) for due in stale))
+        except Exception as e:
+            log.error("[SALESFORCE] Background token refresh failed: %s", e)
+
+
+def start_refresh_task():
+    """Start the background token refresh task. Call during app startup."""
+    global _refresh_task
+    _refresh_task = asyncio.create_task(_refresh_loop())
+
+
+async def stop_refresh_task():
+    """Cancel the background token refresh task. Call during app shutdown."""
+    global _refresh_task
+    if _refresh_task:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+
+
+async def close_http_client():
+    """Close the shared Salesforce HTTP client. Call during app shutdown."""
+    await _sf_client.aclose()
+
+
 # Define logout endpoint
 async def salesforce_logout(request):
     """Clear credentials and logout"""
@@ -26,25 +157,19 @@ async def salesforce_logout(request):
     api_key = request.cookies.get("api_key")
 
     # Validate API key and get user_id mapping
-    user_id = validate_api_key(api_key)
+    user_id = validate_api_key_cached(api_key)
 
     oauth_data = load_oauth_data()
-    users = oauth_data.get("users", [])
 
     # Find user entry by user_id
-    user_entry = None
-    for user in users:
-        if user.get("user_id") == user_id:
-            user_entry = user
-            break
+    user_entry = get_user(user_id, oauth_data)
     # user found
     if user_entry:
         # remove salesforce creds
         user_entry["services"].pop("salesforce", None)
 
         # write back
-        oauth_data["users"] = users
-        save_oauth_data(oauth_data)
+        save_oauth_user(oauth_data, user_entry)
 
     # Successful response
     response = JSONResponse({
@@ -71,7 +196,7 @@ async def salesforce_login(request):
         )
 
     # Validate API key
-    user_id = validate_api_key(api_key)
+    user_id = validate_api_key_cached(api_key)
 
     if not user_id:
         return JSONResponse(
@@ -80,15 +205,7 @@ async def salesforce_login(request):
         )
 
     # Pass user_id via state parameter (will be returned in callback)
-    base = f"https://{SF_DOMAIN}.salesforce.com/services/oauth2/authorize"
-    params = {
-        "response_type": "code",
-        "client_id": SF_CLIENT_ID,
-        "redirect_uri": SF_CALLBACK_URL,
-        "scope": "api refresh_token offline_access",
-        "state": user_id  # Pass user_id to callback
-    }
-    return RedirectResponse(f"{base}?{urlencode(params)}")
+    return RedirectResponse(f"{_AUTHORIZE_URL}&state={quote(user_id, safe='')}")
 
 
 async def salesforce_callback(request):
@@ -120,7 +237,7 @@ async def salesforce_callback(request):
         "redirect_uri": SF_CALLBACK_URL,
     }
 
-    r = requests.post(token_url, data=data)
+    r = await _sf_client.post(token_url, data=data)
     if r.status_code != 200:
         return JSONResponse(
             {"error": "Failed to get token", "details": r.text},
@@ -132,14 +249,8 @@ async def salesforce_callback(request):
     # Store Salesforce tokens with new schema
     oauth_data = load_oauth_data()
 
-    users = oauth_data.get("users", [])
-
     # Find user entry by user_id
-    user_entry = None
-    for user in users:
-        if user.get("user_id") == user_id:
-            user_entry = user
-            break
+    user_entry = get_user(user_id, oauth_data)
 
     if not user_entry:
         # User doesn't exist - this shouldn't happen if they logged in with Google first
@@ -166,8 +277,7 @@ async def salesforce_callback(request):
         "scopes": creds.get("scope", "api refresh_token offline_access").split()
     }
 
-    oauth_data["users"] = users
-    save_oauth_data(oauth_data)
+    save_oauth_user(oauth_data, user_entry)
 
     # Redirect to frontend with success message
     return RedirectResponse(
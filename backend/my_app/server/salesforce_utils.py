@@ -4,12 +4,31 @@ Salesforce OAuth token management utilities
 import os
 import json
 import time
+import asyncio
+import logging
+import threading
 import requests
-from pathlib import Path
+from .oauth_store import get_oauth_store
 
 
+log = logging.getLogger(__name__)
+
 _s3_client = None
 
+# Salesforce tokens are refreshed once older than this
+TOKEN_MAX_AGE_MS = 5_400_000  # 90 minutes
+
+# Concurrent refreshes for the same user share one OAuth round trip: the first
+# caller refreshes, callers within REFRESH_RESULT_TTL reuse its result.
+REFRESH_RESULT_TTL = 5  # seconds
+_refresh_locks: dict[str, threading.Lock] = {}
+_refresh_results: dict[str, tuple[float, dict]] = {}
+
+# Local oauth data, reused until another connection commits to the SQLite
+# store, plus user_id and API key_hash -> user entry indexes over the same objects
+_oauth_cache = {"version": None, "data": None, "index": {}, "key_index": {}}
+_oauth_cache_lock = threading.Lock()
+
 
 def _get_s3_client():
     global _s3_client
@@ -24,78 +43,217 @@ def _use_s3():
     return bool(settings.OAUTH_S3_BUCKET)
 
 
-def get_oauth_file_path():
-    """Get the path to oauth.json file"""
-    return Path(__file__).parent / "oauth.json"
-
-
 def load_oauth_data():
-    """Load oauth.json data"""
+    """
+    Load oauth data as {"users": [...]}
+
+    Locally, users come from the SQLite store (oauth_store) and are cached
+    until another connection commits. Callers share the cached dict, so
+    mutations must be followed by save_oauth_data() or save_oauth_user().
+    """
     if _use_s3():
         from ..config.settings import settings
         try:
             obj = _get_s3_client().get_object(
                 Bucket=settings.OAUTH_S3_BUCKET, Key=settings.OAUTH_S3_KEY
             )
-            return json.loads(obj["Body"].read().decode("utf-8"))
+            data = json.loads(obj["Body"].read().decode("utf-8"))
         except _get_s3_client().exceptions.NoSuchKey:
             return {"users": []}
-    path = get_oauth_file_path()
-    if path.exists():
-        with open(path, "r") as f:
-            return json.load(f)
-    return {"users": []}
+        _normalize_users(data)
+        return data
+    store = get_oauth_store()
+    with _oauth_cache_lock:
+        version = store.data_version()
+        if version == _oauth_cache["version"] and _oauth_cache["data"] is not None:
+            return _oauth_cache["data"]
+        data = {"users": store.list_users()}
+        _normalize_users(data)
+        _oauth_cache["version"] = version
+        _oauth_cache["data"] = data
+        _oauth_cache["index"] = _build_user_index(data)
+        _oauth_cache["key_index"] = _build_key_index(data)
+        return data
+
+
+def _normalize_issued_at(issued_at):
+    """Coerce a Salesforce issued_at (ms, often a string) to int, or None"""
+    if issued_at is None or isinstance(issued_at, int):
+        return issued_at
+    try:
+        return int(issued_at)
+    except (ValueError, TypeError):
+        return None
+
+
+def _normalize_users(data):
+    """Normalize Salesforce issued_at once at load time"""
+    for user in data.get("users", []):
+        sf_creds = ((user.get("services") or {}).get("salesforce") or {}).get("credentials")
+        if isinstance(sf_creds, dict) and "issued_at" in sf_creds:
+            sf_creds["issued_at"] = _normalize_issued_at(sf_creds["issued_at"])
 
 
 def save_oauth_data(data):
-    """Save data to oauth.json"""
+    """
+    Save all users in data, replacing what is stored
+
+    Users missing from data are deleted, as when oauth.json was rewritten
+    whole. Prefer save_oauth_user() when only one user changed: locally it
+    writes a single row instead of every user.
+    """
     if _use_s3():
         from ..config.settings import settings
         _get_s3_client().put_object(
             Bucket=settings.OAUTH_S3_BUCKET,
             Key=settings.OAUTH_S3_KEY,
-            Body=json.dumps(data, indent=2).encode("utf-8"),
+            Body=json.dumps(data, separators=(",", ":")).encode("utf-8"),
             ContentType="application/json",
         )
     else:
-        with open(get_oauth_file_path(), "w") as f:
-            json.dump(data, f, indent=2)
+        with _oauth_cache_lock:
+            get_oauth_store().replace_users(data.get("users", []))
+            # data_version only moves for other connections' commits, so the
+            # cache has to follow our own writes here
+            _oauth_cache["data"] = data
+            _oauth_cache["index"] = _build_user_index(data)
+            _oauth_cache["key_index"] = _build_key_index(data)
+
+
+def save_oauth_user(data, user):
+    """
+    Save a single user entry from data
+
+    The S3 backend stores one document, so it falls back to save_oauth_data().
+    """
+    if _use_s3():
+        save_oauth_data(data)
+    else:
+        with _oauth_cache_lock:
+            get_oauth_store().upsert_user(user)
+            if data is _oauth_cache["data"]:
+                _oauth_cache["index"][user.get("user_id")] = user
+                key_hash = (user.get("api_key") or {}).get("key_hash")
+                if key_hash:
+                    _oauth_cache["key_index"][key_hash] = user
+            else:
+                # The cached copy no longer matches the store; reload on next use
+                _oauth_cache["data"] = None
+
+
+def _build_user_index(data):
+    """Map user_id to user entry; entries alias the objects in data["users"]"""
+    return {u.get("user_id"): u for u in data.get("users", [])}
+
+
+def _build_key_index(data):
+    """Map API key_hash to user entry"""
+    index = {}
+    for u in data.get("users", []):
+        key_hash = (u.get("api_key") or {}).get("key_hash")
+        if key_hash:
+            index[key_hash] = u
+    return index
+
+
+def get_user_by_key_hash(key_hash, data=None):
+    """
+    Look up the user entry whose stored API key hash matches key_hash.
+
+    Args:
+        key_hash: hash_api_key() of the presented key
+        data: oauth data returned by load_oauth_data(); loaded if omitted.
+
+    Returns:
+        dict: The user entry, or None if no user holds that key
+    """
+    if data is None:
+        data = load_oauth_data()
+    if data is _oauth_cache["data"]:
+        user = _oauth_cache["key_index"].get(key_hash)
+        # Entries can go stale when a key is revoked or replaced in place
+        if user is not None and (user.get("api_key") or {}).get("key_hash") == key_hash:
+            return user
+        return None
+    for user in data.get("users", []):
+        if (user.get("api_key") or {}).get("key_hash") == key_hash:
+            return user
+    return None
+
+
+def get_user(user_id, data=None):
+    """
+    Look up a user entry by user_id.
+
+    Args:
+        user_id: The user ID to look up
+        data: oauth data returned by load_oauth_data(); loaded if omitted.
+              Mutations to the returned entry land in this dict.
+
+    Returns:
+        dict: The user entry, or None if not found
+    """
+    if data is None:
+        data = load_oauth_data()
+    if data is _oauth_cache["data"]:
+        return _oauth_cache["index"].get(user_id)
+    for user in data.get("users", []):
+        if user.get("user_id") == user_id:
+            return user
+    return None
 
 
 def refresh_salesforce_token(user_id):
     """
     Refresh Salesforce access token using refresh token.
 
+    Serialized per user; a refresh completed within the last
+    REFRESH_RESULT_TTL seconds is returned instead of refreshing again.
+
     Args:
         user_id: The user ID to refresh tokens for
 
     Returns:
         dict: Updated credentials with new access_token, or None if refresh failed
     """
+    lock = _refresh_locks.setdefault(user_id, threading.Lock())
+    with lock:
+        cached = _refresh_results.get(user_id)
+        if cached and time.monotonic() - cached[0] < REFRESH_RESULT_TTL:
+            return cached[1]
+
+        sf_creds = _refresh_salesforce_token(user_id)
+        if sf_creds:
+            _refresh_results[user_id] = (time.monotonic(), sf_creds)
+        return sf_creds
+
+
+async def refresh_salesforce_token_async(user_id):
+    """Run refresh_salesforce_token in an executor so the event loop is not blocked."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, refresh_salesforce_token, user_id)
+
+
+def _refresh_salesforce_token(user_id):
+    """Perform the refresh token grant and persist the new access token."""
     try:
         # Load current credentials
         data = load_oauth_data()
 
-        # Find user
-        user = None
-        for u in data.get("users", []):
-            if u["user_id"] == user_id:
-                user = u
-                break
-
+        user = get_user(user_id, data)
         if not user:
-            print(f"User {user_id} not found in oauth.json")
+            log.warning("User %s not found in oauth data", user_id)
             return None
 
         # Get Salesforce service data
         sf_service = user.get("services", {}).get("salesforce")
         if not sf_service:
-            print(f"Salesforce service not configured for user {user_id}")
+            log.warning("Salesforce service not configured for user %s", user_id)
             return None
 
         sf_creds = sf_service.get("credentials")
         if not sf_creds or "refresh_token" not in sf_creds:
-            print(f"No refresh token found for user {user_id}")
+            log.warning("No refresh token found for user %s", user_id)
             return None
 
         refresh_token = sf_creds["refresh_token"]
@@ -106,13 +264,13 @@ def refresh_salesforce_token(user_id):
         SF_DOMAIN = os.getenv("SF_DOMAIN", "login")
 
         if not SF_CLIENT_ID or not SF_CLIENT_SECRET:
-            print("Salesforce credentials not configured in environment")
+            log.error("Salesforce credentials not configured in environment")
             return None
 
         # Request new access token
         token_url = f"https://{SF_DOMAIN}.salesforce.com/services/oauth2/token"
 
-        print(f"Refreshing Salesforce token for user {user_id}...")
+        log.info("Refreshing Salesforce token for user %s...", user_id)
 
         response = requests.post(
             token_url,
@@ -132,29 +290,29 @@ def refresh_salesforce_token(user_id):
 
             # Update stored credentials
             sf_creds["access_token"] = new_token_data["access_token"]
-            sf_creds["issued_at"] = new_token_data["issued_at"]
+            sf_creds["issued_at"] = _normalize_issued_at(new_token_data["issued_at"])
             sf_creds["signature"] = new_token_data.get("signature", sf_creds.get("signature"))
 
             # Save updated credentials
-            save_oauth_data(data)
+            save_oauth_user(data, user)
 
-            print(f"Token refreshed successfully for user {user_id}")
+            log.info("Token refreshed successfully for user %s", user_id)
             return sf_creds
         else:
             error_data = response.json() if response.headers.get("content-type") == "application/json" else {}
             error_msg = error_data.get("error", "unknown")
             error_desc = error_data.get("error_description", response.text)
 
-            print(f"Token refresh failed for user {user_id}: {error_msg} - {error_desc}")
+            log.warning("Token refresh failed for user %s: %s - %s", user_id, error_msg, error_desc)
 
             # If refresh token is invalid, user needs to re-authenticate
             if error_msg == "invalid_grant":
-                print("Refresh token is invalid. User must re-authenticate with Salesforce.")
+                log.warning("Refresh token is invalid. User must re-authenticate with Salesforce.")
 
             return None
 
     except Exception as e:
-        print(f"Error refreshing Salesforce token for user {user_id}: {e}")
+        log.error("Error refreshing Salesforce token for user %s: %s", user_id, e)
         return None
 
 
@@ -169,26 +327,21 @@ def should_refresh_token(issued_at_ms):
     Returns:
         bool: True if token should be refreshed
     """
-    if not issued_at_ms:
-        return True
-
-    try:
-        issued_at_sec = int(issued_at_ms) / 1000
-        current_time = time.time()
-        age_seconds = current_time - issued_at_sec
+    if not isinstance(issued_at_ms, int):
+        issued_at_ms = _normalize_issued_at(issued_at_ms)
 
-        # Refresh if older than 90 minutes (5400 seconds)
-        # This gives 30 minute buffer before typical 2-hour expiration
-        return age_seconds > 5400
-    except (ValueError, TypeError):
-        # If we can't parse the timestamp, refresh to be safe
-        return True
+    # Refresh if older than 90 minutes (5400 seconds)
+    # This gives 30 minute buffer before typical 2-hour expiration
+    return issued_at_ms is None or time.time() * 1000 - issued_at_ms > TOKEN_MAX_AGE_MS
 
 
 def get_fresh_salesforce_credentials(user_id, current_creds):
     """
     Get fresh Salesforce credentials, refreshing if necessary.
 
+    Tokens are normally refreshed ahead of time by the background task in
+    salesforce_app; this inline refresh is the fallback.
+
     Args:
         user_id: The user ID
         current_creds: Current stored credentials
@@ -202,7 +355,7 @@ def get_fresh_salesforce_credentials(user_id, current_creds):
     issued_at = current_creds.get("issued_at")
 
     if should_refresh_token(issued_at):
-        print(f"Token is stale (issued_at: {issued_at}), refreshing...")
+        log.info("Token is stale (issued_at: %s), refreshing...", issued_at)
         refreshed_creds = refresh_salesforce_token(user_id)
         return refreshed_creds if refreshed_creds else current_creds
 
@@ -7,28 +7,33 @@ https://developer.telesign.com/enterprise/docs/messaging-api
 """
 
 import os
-import base64
+import asyncio
+import copy
 import hmac
-import hashlib
+import secrets
 import json
-import random
 import time
-from email.utils import formatdate
-from typing import Optional, Dict, List, Any
-from pathlib import Path
+import threading
+from typing import Optional, Dict, Any
 
 # Use standard TeleSign SDK for messaging, voice, phoneid, score
 from telesign.messaging import MessagingClient
 from telesign.phoneid import PhoneIdClient
 from telesign.score import ScoreClient
 from telesign.voice import VoiceClient
-from telesign.util import random_with_n_digits
 
 # Use Enterprise SDK for VerifyClient (cheaper verification tokens)
 from telesignenterprise.verify import VerifyClient
 
 from dotenv import load_dotenv
 
+# orjson parses TeleSign response bodies faster; its JSONDecodeError subclasses json's
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Import logging utility
 from .tool_logger import log_tool_call
 
@@ -41,39 +46,59 @@ SENDER_ID = os.getenv("TELESIGN_SENDER_ID", "")
 ACCOUNT_TYPE = "self-service"  # Set to "self-service" for standard accounts
 
 
-def get_messaging_client() -> MessagingClient:
-    """Get an authenticated TeleSign Messaging client for self-service account"""
+def _parse_body(response) -> dict:
+    """Parsed JSON body of an SDK response, or {} if it has none"""
+    # The SDK already decodes the body into response.json (None if it isn't JSON)
+    if hasattr(response, "json"):
+        return response.json if response.json is not None else {}
+    try:
+        return _loads(response.body) if response.body else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+# One SDK client per class. Each client owns a requests.Session, so reusing the
+# client keeps the TCP+TLS connection to rest-api.telesign.com alive between calls.
+_clients: Dict[type, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(client_cls):
+    """Return the shared, authenticated instance of a TeleSign SDK client class"""
     if not CUSTOMER_ID or not API_KEY:
         raise ValueError("TELESIGN_CUSTOMER_ID and TELESIGN_API_KEY must be set in .env")
-    return MessagingClient(CUSTOMER_ID, API_KEY)
+    client = _clients.get(client_cls)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(client_cls)
+            if client is None:
+                client = _clients[client_cls] = client_cls(CUSTOMER_ID, API_KEY)
+    return client
+
+
+def get_messaging_client() -> MessagingClient:
+    """Get an authenticated TeleSign Messaging client for self-service account"""
+    return _get_client(MessagingClient)
 
 
 def get_voice_client() -> VoiceClient:
     """Get an authenticated TeleSign Voice client"""
-    if not CUSTOMER_ID or not API_KEY:
-        raise ValueError("TELESIGN_CUSTOMER_ID and TELESIGN_API_KEY must be set in .env")
-    return VoiceClient(CUSTOMER_ID, API_KEY)
+    return _get_client(VoiceClient)
 
 
 def get_verify_client() -> VerifyClient:
     """Get an authenticated TeleSign Verify client (Enterprise SDK - cheaper verification tokens)"""
-    if not CUSTOMER_ID or not API_KEY:
-        raise ValueError("TELESIGN_CUSTOMER_ID and TELESIGN_API_KEY must be set in .env")
-    return VerifyClient(CUSTOMER_ID, API_KEY)
+    return _get_client(VerifyClient)
 
 
 def get_phoneid_client() -> PhoneIdClient:
     """Get an authenticated TeleSign PhoneID client"""
-    if not CUSTOMER_ID or not API_KEY:
-        raise ValueError("TELESIGN_CUSTOMER_ID and TELESIGN_API_KEY must be set in .env")
-    return PhoneIdClient(CUSTOMER_ID, API_KEY)
+    return _get_client(PhoneIdClient)
 
 
 def get_score_client() -> ScoreClient:
     """Get an authenticated TeleSign Score (Intelligence) client"""
-    if not CUSTOMER_ID or not API_KEY:
-        raise ValueError("TELESIGN_CUSTOMER_ID and TELESIGN_API_KEY must be set in .env")
-    return ScoreClient(CUSTOMER_ID, API_KEY)
+    return _get_client(ScoreClient)
 
 
 
@@ -107,13 +132,7 @@ def send_sms(phone_number: str, message: str, message_type: str = "OTP") -> dict
         response = messaging.message(phone_number, message, message_type)
         
         # Parse response
-        try:
-            if isinstance(response.body, str):
-                response_data = json.loads(response.body)
-            else:
-                response_data = response.body
-        except (json.JSONDecodeError, AttributeError):
-            response_data = {}
+        response_data = _parse_body(response)
         
         # Log the result
         result = {
@@ -177,13 +196,7 @@ def send_voice_call(phone_number: str, message: str, voice_name: str = "female")
         voice = get_voice_client()
         response = voice.call(phone_number, message, voice_name)
         
-        try:
-            if isinstance(response.body, str):
-                response_data = json.loads(response.body)
-            else:
-                response_data = response.body
-        except (json.JSONDecodeError, AttributeError):
-            response_data = {}
+        response_data = _parse_body(response)
         
         result = {
             "status_code": response.status_code,
@@ -220,10 +233,83 @@ def send_voice_call(phone_number: str, message: str, voice_name: str = "female")
         return error_result
 
 
-def verify_phone_number(phone_number: str) -> dict:
-    """Verify a phone number using TeleSign PhoneID SDK"""
+# PhoneID response fields: (result key, path into the response, default)
+_PHONEID_FIELDS = (
+    ("phone_type", ("phone_type", "description"), "Unknown"),
+    ("carrier", ("carrier", "name"), "Unknown"),
+    ("country", ("location", "country", "name"), "Unknown"),
+    ("country_code", ("location", "country", "iso2"), ""),
+    ("state", ("location", "state"), ""),
+    ("city", ("location", "city"), ""),
+    ("zip", ("location", "zip"), ""),
+    ("time_zone", ("location", "time_zone", "name"), ""),
+    ("formatted_number", ("numbering", "original", "complete_phone_number"), ""),
+    ("blocked", ("blocklisting", "blocked"), False),
+)
+
+_PHONEID_CONTACT_FIELDS = (
+    ("first_name", ("contact", "first_name"), ""),
+    ("last_name", ("contact", "last_name"), ""),
+    ("email", ("contact", "email_address"), ""),
+    ("address", ("contact", "address1"), ""),
+    ("city", ("contact", "city"), ""),
+    ("state", ("contact", "state_province"), ""),
+    ("zip", ("contact", "zip_postal_code"), ""),
+)
+
+
+def _dig(data: dict, path: tuple, default):
+    """Follow path through nested dicts, returning default if any level is missing"""
+    for key in path[:-1]:
+        data = data.get(key)
+        if not isinstance(data, dict):
+            return default
+    return data.get(path[-1], default)
+
+
+# Successful PhoneID results: {(number, verbose): (result, expires_at)}
+PHONEID_CACHE_TTL = 3600  # seconds
+PHONEID_CACHE_MAX = 10_000
+_phoneid_cache: Dict[tuple, tuple] = {}
+# Lookups run in to_thread workers (verify_phone_number_async/_many)
+_phoneid_cache_lock = threading.Lock()
+
+
+def _cache_phoneid(key: tuple, result: dict):
+    """Cache a private copy, so callers mutating their result can't change later hits"""
+    result = copy.deepcopy(result)
+    now = time.monotonic()
+    with _phoneid_cache_lock:
+        if len(_phoneid_cache) >= PHONEID_CACHE_MAX:
+            for k in [k for k, (_, exp) in _phoneid_cache.items() if exp <= now]:
+                del _phoneid_cache[k]
+            if len(_phoneid_cache) >= PHONEID_CACHE_MAX:
+                _phoneid_cache.clear()
+        _phoneid_cache[key] = (result, now + PHONEID_CACHE_TTL)
+
+
+def verify_phone_number(phone_number: str, verbose: bool = False) -> dict:
+    """
+    Verify a phone number using TeleSign PhoneID SDK
+    
+    Set verbose=True to include the raw response as full_response.
+    """
     phone_number = phone_number.lstrip('+').strip()
     
+    # Carrier/location data changes slowly; skip the billed lookup on retries
+    with _phoneid_cache_lock:
+        cached = _phoneid_cache.get((phone_number, verbose))
+    if cached and cached[1] > time.monotonic():
+        result = copy.deepcopy(cached[0])
+        log_tool_call(
+            tool_name="verify_phone_number",
+            input_data={"phone_number": phone_number},
+            output_data=result,
+            success=True,
+            metadata={"reference_id": result.get("reference_id"), "cached": True}
+        )
+        return result
+    
     log_tool_call(
         tool_name="verify_phone_number",
         input_data={"phone_number": phone_number},
@@ -239,46 +325,22 @@ def verify_phone_number(phone_number: str) -> dict:
     
     response = client.phoneid(**payload)
     
-    try:
-        if isinstance(response.body, str):
-            response_data = json.loads(response.body)
-        else:
-            response_data = response.body
-    except (json.JSONDecodeError, AttributeError):
-        response_data = {}
+    response_data = _parse_body(response)
     
     try:
         if response.status_code == 200:
             # Extract detailed information from the response
-            location = response_data.get("location", {})
-            numbering = response_data.get("numbering", {})
-            contact = response_data.get("contact", {})
-            
             result = {
                 "status_code": response.status_code,
                 "reference_id": response_data.get("reference_id"),
-                "phone_type": response_data.get("phone_type", {}).get("description", "Unknown"),
-                "carrier": response_data.get("carrier", {}).get("name", "Unknown"),
-                "country": location.get("country", {}).get("name", "Unknown"),
-                "country_code": location.get("country", {}).get("iso2", ""),
-                "state": location.get("state", ""),
-                "city": location.get("city", ""),
-                "zip": location.get("zip", ""),
-                "time_zone": location.get("time_zone", {}).get("name", ""),
-                "formatted_number": numbering.get("original", {}).get("complete_phone_number", ""),
-                "blocked": response_data.get("blocklisting", {}).get("blocked", False),
+                **{key: _dig(response_data, path, default) for key, path, default in _PHONEID_FIELDS},
                 "contact_info": {
-                    "first_name": contact.get("first_name", ""),
-                    "last_name": contact.get("last_name", ""),
-                    "email": contact.get("email_address", ""),
-                    "address": contact.get("address1", ""),
-                    "city": contact.get("city", ""),
-                    "state": contact.get("state_province", ""),
-                    "zip": contact.get("zip_postal_code", "")
+                    key: _dig(response_data, path, default) for key, path, default in _PHONEID_CONTACT_FIELDS
                 },
-                "success": True,
-                "full_response": response_data
+                "success": True
             }
+            if verbose:
+                result["full_response"] = response_data
             
             log_tool_call(
                 tool_name="verify_phone_number",
@@ -288,6 +350,7 @@ def verify_phone_number(phone_number: str) -> dict:
                 metadata={"reference_id": result.get("reference_id")}
             )
             
+            _cache_phoneid((phone_number, verbose), result)
             return result
             
         else:
@@ -327,8 +390,12 @@ def verify_phone_number(phone_number: str) -> dict:
         return error_result
 
 
-def get_message_status(reference_id: str) -> dict:
-    """Check the delivery status of a sent message"""
+def get_message_status(reference_id: str, verbose: bool = False) -> dict:
+    """
+    Check the delivery status of a sent message
+    
+    The raw response is included as full_response on failure or when verbose=True.
+    """
     log_tool_call(
         tool_name="get_message_status",
         input_data={"reference_id": reference_id}
@@ -338,20 +405,15 @@ def get_message_status(reference_id: str) -> dict:
         client = get_messaging_client()
         response = client.status(reference_id)
         
-        try:
-            if isinstance(response.body, str):
-                response_data = json.loads(response.body)
-            else:
-                response_data = response.body
-        except (json.JSONDecodeError, AttributeError):
-            response_data = {}
+        response_data = _parse_body(response)
         
         result = {
             "status_code": response.status_code,
             "status": response_data.get("status", {}),
-            "success": response.status_code == 200,
-            "full_response": response_data
+            "success": response.status_code == 200
         }
+        if verbose or not result["success"]:
+            result["full_response"] = response_data
         
         log_tool_call(
             tool_name="get_message_status",
@@ -399,7 +461,7 @@ def send_verification_code(phone_number: str, code_length: int = 5) -> dict:
     
     try:
         # Generate one-time passcode (OTP)
-        verify_code = random_with_n_digits(code_length)
+        verify_code = f"{secrets.randbelow(10 ** code_length):0{code_length}d}"
         
         # Get verify client
         verify = get_verify_client()
@@ -408,13 +470,7 @@ def send_verification_code(phone_number: str, code_length: int = 5) -> dict:
         response = verify.sms(phone_number, verify_code=verify_code)
         
         # Parse response
-        try:
-            if isinstance(response.body, str):
-                response_data = json.loads(response.body)
-            else:
-                response_data = response.body
-        except (json.JSONDecodeError, AttributeError):
-            response_data = {}
+        response_data = _parse_body(response)
         
         result = {
             "status_code": response.status_code,
@@ -425,6 +481,9 @@ def send_verification_code(phone_number: str, code_length: int = 5) -> dict:
             "success": response.status_code in [200, 201, 202, 203, 290, 291]
         }
         
+        if result["success"] and result["reference_id"]:
+            _store_otp(result["reference_id"], verify_code)
+        
         log_tool_call(
             tool_name="send_verification_code",
             input_data={"phone_number": phone_number},
@@ -452,6 +511,49 @@ def send_verification_code(phone_number: str, code_length: int = 5) -> dict:
         return error_result
 
 
+# Codes sent by send_verification_code: {reference_id: (code, expires_at)}
+OTP_TTL = 300  # seconds
+_otp_store: Dict[str, tuple] = {}
+_otp_store_lock = threading.Lock()
+
+
+def _store_otp(reference_id: str, code: str):
+    now = time.monotonic()
+    with _otp_store_lock:
+        for k in [k for k, (_, exp) in _otp_store.items() if exp <= now]:
+            del _otp_store[k]
+        _otp_store[reference_id] = (code, now + OTP_TTL)
+
+
+def verify_otp_by_ref(reference_id: str, user_code: str) -> dict:
+    """
+    Verify a user-entered code against the code sent for reference_id
+    
+    Each sent code can be checked once and expires after OTP_TTL seconds.
+    
+    Returns:
+        dict: Verification result
+    """
+    with _otp_store_lock:
+        entry = _otp_store.pop(reference_id, None)
+    
+    if not entry or entry[1] <= time.monotonic():
+        return {
+            "status_code": 400,
+            "valid": False,
+            "message": "Verification code expired or not found",
+            "reference_id": reference_id
+        }
+    
+    is_valid = hmac.compare_digest(entry[0].encode(), user_code.strip().encode())
+    return {
+        "status_code": 200,
+        "valid": is_valid,
+        "message": "Your code is correct." if is_valid else "Your code is incorrect.",
+        "reference_id": reference_id
+    }
+
+
 def verify_code(reference_id: str, user_code: str, original_code: str = None) -> dict:
     """
     Verify a user-entered code
@@ -459,7 +561,8 @@ def verify_code(reference_id: str, user_code: str, original_code: str = None) ->
     Args:
         reference_id: Reference ID from send_verification_code
         user_code: Code entered by user
-        original_code: Original generated code (for local verification)
+        original_code: Original generated code (for local verification).
+                       If omitted, the code stored when it was sent is used.
     
     Returns:
         dict: Verification result
@@ -469,7 +572,8 @@ def verify_code(reference_id: str, user_code: str, original_code: str = None) ->
     
     # Determine if the codes match
     if original_code:
-        is_valid = (original_code == user_code)
+        # Constant-time comparison so response timing doesn't leak matching digits
+        is_valid = hmac.compare_digest(str(original_code).encode(), user_code.encode())
         
         return {
             "status_code": 200,
@@ -478,21 +582,17 @@ def verify_code(reference_id: str, user_code: str, original_code: str = None) ->
             "reference_id": reference_id
         }
     else:
-        return {
-            "status_code": 400,
-            "valid": False,
-            "message": "Original verification code not provided",
-            "reference_id": reference_id
-        }
+        return verify_otp_by_ref(reference_id, user_code)
 
 
-def assess_phone_risk(phone_number: str, account_lifecycle_event: str = "create") -> dict:
+def assess_phone_risk(phone_number: str, account_lifecycle_event: str = "create", verbose: bool = False) -> dict:
     """
     Get fraud risk assessment for a phone number using TeleSign Intelligence (Score API)
     
     Args:
         phone_number: Phone number to assess
         account_lifecycle_event: Stage of account lifecycle (create, sign-in, transact, update)
+        verbose: Include the raw response as full_response on success
     
     Returns:
         dict: Risk assessment results
@@ -512,10 +612,7 @@ def assess_phone_risk(phone_number: str, account_lifecycle_event: str = "create"
         response = intelligence.score(phone_number, account_lifecycle_event)
         
         # Parse response
-        if isinstance(response.body, str):
-            response_data = json.loads(response.body)
-        else:
-            response_data = response.body
+        response_data = _parse_body(response)
         
         if response.status_code == 200:
             # Extract risk information
@@ -532,9 +629,10 @@ def assess_phone_risk(phone_number: str, account_lifecycle_event: str = "create"
                 "phone_type": phone_type_data.get("description", "Unknown"),
                 "carrier": numbering_data.get("original", {}).get("carrier", {}).get("name", "Unknown"),
                 "account_lifecycle_event": account_lifecycle_event,
-                "success": True,
-                "full_response": response_data
+                "success": True
             }
+            if verbose:
+                result["full_response"] = response_data
         else:
             result = {
                 "status_code": response.status_code,
@@ -751,27 +849,23 @@ def get_whatsapp_message_status(reference_id: str) -> dict:
 # ==================== END WHATSAPP FUNCTIONS ====================
 
 
-def get_detailed_message_status(reference_id: str) -> dict:
+def get_detailed_message_status(reference_id: str, verbose: bool = False) -> dict:
     """
     Get detailed message status including delivery timestamps and carrier info
     
+    Set verbose=True to include the raw response as full_response.
+    
     Returns:
         dict: Detailed status including timestamps, errors, and carrier feedback
     """
     client = get_messaging_client()
     response = client.status(reference_id)
     
-    try:
-        if isinstance(response.body, str):
-            response_data = json.loads(response.body)
-        else:
-            response_data = response.body
-    except (json.JSONDecodeError, AttributeError):
-        response_data = {}
+    response_data = _parse_body(response)
     
     status = response_data.get('status', {})
     
-    return {
+    result = {
         "status_code": response.status_code,
         "reference_id": reference_id,
         "message_status_code": status.get('code'),  # Renamed to avoid conflict
@@ -782,9 +876,11 @@ def get_detailed_message_status(reference_id: str) -> dict:
         "errors": response_data.get('errors', []),
         "recipient": response_data.get('recipient'),
         "price": response_data.get('price'),
-        "currency": response_data.get('currency'),
-        "full_response": response_data
+        "currency": response_data.get('currency')
     }
+    if verbose:
+        result["full_response"] = response_data
+    return result
 
 
 def poll_message_until_complete(reference_id: str, max_attempts: int = 10, delay_seconds: int = 2) -> dict:
@@ -799,8 +895,6 @@ def poll_message_until_complete(reference_id: str, max_attempts: int = 10, delay
     Returns:
         dict: Final message status
     """
-    import time
-    
     for attempt in range(max_attempts):
         status = get_detailed_message_status(reference_id)
         
@@ -883,6 +977,168 @@ def batch_send_sms(recipients: list[dict]) -> list[dict]:
     return results
 
 
+# ==================== ASYNC VARIANTS ====================
+# The SDK is synchronous; these run it in a worker thread so async routes
+# don't block the event loop while waiting on TeleSign.
+
+async def send_sms_async(phone_number: str, message: str, message_type: str = "OTP") -> dict:
+    """Async variant of send_sms"""
+    return await asyncio.to_thread(send_sms, phone_number, message, message_type)
+
+
+async def send_verification_code_async(phone_number: str, code_length: int = 5) -> dict:
+    """Async variant of send_verification_code"""
+    return await asyncio.to_thread(send_verification_code, phone_number, code_length)
+
+
+async def verify_phone_number_async(phone_number: str) -> dict:
+    """Async variant of verify_phone_number"""
+    return await asyncio.to_thread(verify_phone_number, phone_number)
+
+
+async def assess_phone_risk_async(phone_number: str, account_lifecycle_event: str = "create") -> dict:
+    """Async variant of assess_phone_risk"""
+    return await asyncio.to_thread(assess_phone_risk, phone_number, account_lifecycle_event)
+
+
+async def screen_and_otp(phone_number: str, code_length: int = 5,
+                         account_lifecycle_event: str = "create") -> dict:
+    """
+    Run PhoneID, risk assessment and the OTP send for a signup concurrently
+
+    Returns:
+        dict: {"phone_id": ..., "risk": ..., "verification": ...} with each call's result
+    """
+    phone_id, risk, verification = await asyncio.gather(
+        verify_phone_number_async(phone_number),
+        assess_phone_risk_async(phone_number, account_lifecycle_event),
+        send_verification_code_async(phone_number, code_length),
+    )
+    return {"phone_id": phone_id, "risk": risk, "verification": verification}
+
+
+BATCH_CONCURRENCY = 20
+
+
+async def _gather_bounded(func, phone_numbers: list[str], *args,
+                          concurrency: int = BATCH_CONCURRENCY,
+                          return_exceptions: bool = False) -> list:
+    """Run an async per-number call over phone_numbers, at most `concurrency` at a time"""
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(phone):
+        async with sem:
+            return await func(phone, *args)
+
+    return await asyncio.gather(*(_one(phone) for phone in phone_numbers),
+                                return_exceptions=return_exceptions)
+
+
+async def verify_phone_number_many(phone_numbers: list[str]) -> list[dict]:
+    """
+    Look up PhoneID for many numbers concurrently
+
+    Returns:
+        list[dict]: verify_phone_number results, in the same order as phone_numbers
+    """
+    return await _gather_bounded(verify_phone_number_async, phone_numbers)
+
+
+async def assess_phone_risk_many(phone_numbers: list[str], account_lifecycle_event: str = "create") -> list[dict]:
+    """
+    Get risk assessments for many numbers concurrently
+
+    Returns:
+        list[dict]: assess_phone_risk results, in the same order as phone_numbers
+    """
+    return await _gather_bounded(assess_phone_risk_async, phone_numbers, account_lifecycle_event)
+
+
+async def send_bulk_sms(phone_numbers: list[str], message: str,
+                        concurrency: int = BATCH_CONCURRENCY) -> list:
+    """
+    Send the same SMS to many numbers concurrently
+
+    Args:
+        phone_numbers: Recipients in E.164 format
+        message: Message text
+        concurrency: Maximum number of sends in flight at once
+
+    Returns:
+        list: send_sms results in the same order as phone_numbers; a send that
+        raised is returned as its exception instead of failing the whole batch
+    """
+    return await _gather_bounded(send_sms_async, phone_numbers, message,
+                                 concurrency=concurrency, return_exceptions=True)
+
+
+# ==================== OTP SEND QUEUE ====================
+# Lets a route answer "OTP queued" immediately; workers send the code and the
+# result is picked up later with get_queued_verification().
+
+OTP_WORKERS = 4
+OTP_RESULT_TTL = 600  # seconds
+_otp_queue: "asyncio.Queue | None" = None
+_otp_workers: list = []
+_otp_results: Dict[str, tuple] = {}
+
+
+async def _otp_worker():
+    while True:
+        tracking_id, phone_number, code_length = await _otp_queue.get()
+        try:
+            result = await send_verification_code_async(phone_number, code_length)
+        except Exception as e:
+            result = {"status_code": 500, "success": False, "error": str(e)}
+        _otp_results[tracking_id] = (result, time.monotonic() + OTP_RESULT_TTL)
+        _otp_queue.task_done()
+
+
+def start_otp_workers():
+    """Start the OTP send workers. Call during app startup."""
+    global _otp_queue
+    _otp_queue = asyncio.Queue()
+    _otp_workers[:] = [asyncio.create_task(_otp_worker()) for _ in range(OTP_WORKERS)]
+
+
+async def stop_otp_workers():
+    """Cancel the OTP send workers. Call during app shutdown."""
+    global _otp_queue
+    for task in _otp_workers:
+        task.cancel()
+    await asyncio.gather(*_otp_workers, return_exceptions=True)
+    _otp_workers.clear()
+    _otp_queue = None
+
+
+async def queue_verification_code(phone_number: str, code_length: int = 5) -> str:
+    """
+    Queue a verification code send without waiting for TeleSign
+
+    Returns:
+        str: Tracking ID for get_queued_verification()
+    """
+    if _otp_queue is None:
+        raise RuntimeError("OTP workers are not running")
+    now = time.monotonic()
+    for k in [k for k, (_, exp) in _otp_results.items() if exp <= now]:
+        del _otp_results[k]
+    tracking_id = secrets.token_urlsafe(16)
+    await _otp_queue.put((tracking_id, phone_number, code_length))
+    return tracking_id
+
+
+def get_queued_verification(tracking_id: str) -> Optional[dict]:
+    """
+    Get the send_verification_code result for a queued send
+
+    Returns:
+        dict: The result (removed once read), or None if still pending or unknown
+    """
+    entry = _otp_results.pop(tracking_id, None)
+    return entry[0] if entry else None
+
+
 # Keep backward compatibility
 def load_credentials() -> tuple[str, str]:
     """Load Telesign credentials"""
@@ -3,13 +3,154 @@ Transaction logging for Telesign API calls
 """
 
 import json
+import mmap
 import os
+import logging
+import queue
+import atexit
+import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
-# Path to log file
-LOG_FILE = Path(__file__).parent / "telesign_transactions.json"
+logger = logging.getLogger(__name__)
+
+# orjson encodes/decodes log lines faster; its JSONDecodeError subclasses json's
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+    _loads = json.loads
+
+# Path to log file (one JSON object per line, appended)
+LOG_FILE = Path(__file__).parent / "telesign_transactions.jsonl"
+ROTATED_LOG_FILE = Path(__file__).parent / "telesign_transactions.jsonl.1"
+LEGACY_LOG_FILE = Path(__file__).parent / "telesign_transactions.json"
+
+# Keep the most recent transactions in memory; the file is rotated to .1 once it
+# passes MAX_LOG_BYTES, so at most two files' worth stays on disk
+MAX_TRANSACTIONS = 1000
+MAX_LOG_BYTES = 2_000_000
+
+
+def _migrate_legacy_log() -> None:
+    """Convert the old JSON-array log to JSON lines if no .jsonl exists yet"""
+    if LOG_FILE.exists() or not LEGACY_LOG_FILE.exists():
+        return
+    try:
+        with open(LEGACY_LOG_FILE, 'r') as f:
+            logs = _loads(f.read())
+    except json.JSONDecodeError:
+        return
+    with open(LOG_FILE, 'w') as f:
+        f.writelines(_dumps(log) + '\n' for log in logs[-MAX_TRANSACTIONS:])
+
+
+def _tail_lines(path: Path, limit: int) -> List[bytes]:
+    """Return up to the last `limit` lines of path, reading backwards from the end"""
+    if limit <= 0 or not path.exists() or path.stat().st_size == 0:
+        return []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = len(mm)
+        if mm[end - 1:end] == b'\n':
+            end -= 1
+        lines = []
+        while end > 0 and len(lines) < limit:
+            start = mm.rfind(b'\n', 0, end) + 1
+            lines.append(mm[start:end])
+            end = start - 1
+    lines.reverse()
+    return lines
+
+
+def _read_logs() -> List[Dict]:
+    """Read the last MAX_TRANSACTIONS logged transactions, skipping any partially written line"""
+    _migrate_legacy_log()
+    lines = _tail_lines(LOG_FILE, MAX_TRANSACTIONS)
+    lines[:0] = _tail_lines(ROTATED_LOG_FILE, MAX_TRANSACTIONS - len(lines))
+    logs = []
+    for line in lines:
+        try:
+            logs.append(_loads(line))
+        except json.JSONDecodeError:
+            continue
+    return logs
+
+
+def _write_entries(entries: List[Dict]) -> None:
+    """Append entries to the log in one write"""
+    _migrate_legacy_log()
+    with open(LOG_FILE, 'a') as f:
+        f.write(''.join(_dumps(e) + '\n' for e in entries))
+    
+    if LOG_FILE.stat().st_size > MAX_LOG_BYTES:
+        os.replace(LOG_FILE, ROTATED_LOG_FILE)
+
+
+def _writer_loop() -> None:
+    """Drain queued entries and write them in batches"""
+    while True:
+        entries = [_log_queue.get()]
+        while True:
+            try:
+                entries.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _write_entries(entries)
+        except Exception as e:
+            logger.error("[LOG] Failed to write %d transactions: %s", len(entries), e)
+        finally:
+            for _ in entries:
+                _log_queue.task_done()
+
+
+def flush_transactions() -> None:
+    """Block until every queued transaction has been written"""
+    _log_queue.join()
+
+
+_log_queue: "queue.Queue[Dict]" = queue.Queue()
+threading.Thread(target=_writer_loop, name="telesign-log-writer", daemon=True).start()
+atexit.register(flush_transactions)
+
+
+# In-memory mirror of the retained log, with counters kept in step, so the
+# read functions never touch the file
+_logs: deque = deque(maxlen=MAX_TRANSACTIONS)
+_stats = {"total": 0, "successful": 0, "by_type": {}}
+_logs_lock = threading.Lock()
+
+
+def _count(entry: Dict, delta: int) -> None:
+    _stats["total"] += delta
+    if entry.get("success"):
+        _stats["successful"] += delta
+    by_type = _stats["by_type"]
+    tx_type = entry.get("transaction_type")
+    by_type[tx_type] = by_type.get(tx_type, 0) + delta
+    if not by_type[tx_type]:
+        del by_type[tx_type]
+
+
+def _remember(entry: Dict) -> None:
+    """Add entry to the mirror, uncounting the entry it evicts (call under _logs_lock)"""
+    if len(_logs) == _logs.maxlen:
+        _count(_logs[0], -1)
+    _logs.append(entry)
+    _count(entry, 1)
+
+
+for _entry in _read_logs():
+    _remember(_entry)
 
 
 def log_transaction(
@@ -30,9 +171,10 @@ def log_transaction(
         status_code: HTTP status code
         reference_id: Telesign reference ID
         message: Message content (optional)
-        response_data: Full response data
+        response_data: Full response data (only kept for failed transactions)
         error: Error message if any
     """
+    success = status_code == 200
     # Create log entry
     log_entry = {
         "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -42,30 +184,17 @@ def log_transaction(
         "reference_id": reference_id,
         "message": message,
         "error": error,
-        "response": response_data,
-        "success": status_code == 200
+        "response": response_data if (error or not success) else None,
+        "success": success
     }
     
-    # Read existing logs
-    logs = []
-    if LOG_FILE.exists():
-        try:
-            with open(LOG_FILE, 'r') as f:
-                logs = json.load(f)
-        except json.JSONDecodeError:
-            logs = []
-    
-    # Append new log
-    logs.append(log_entry)
-    
-    # Keep only last 1000 transactions (optional)
-    logs = logs[-1000:]
+    with _logs_lock:
+        _remember(log_entry)
     
-    # Write back to file
-    with open(LOG_FILE, 'w') as f:
-        json.dump(logs, f, indent=2)
+    # Written by the background writer thread
+    _log_queue.put(log_entry)
     
-    print(f"[LOG] {transaction_type} to {phone_number}: Status {status_code}")
+    logger.debug("[LOG] %s to %s: Status %s", transaction_type, phone_number, status_code)
 
 
 def get_recent_transactions(limit: int = 50) -> List[Dict]:
@@ -78,15 +207,8 @@ def get_recent_transactions(limit: int = 50) -> List[Dict]:
     Returns:
         List of transaction dictionaries
     """
-    if not LOG_FILE.exists():
-        return []
-    
-    try:
-        with open(LOG_FILE, 'r') as f:
-            logs = json.load(f)
-        return logs[-limit:]
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    with _logs_lock:
+        return list(_logs)[-limit:]
 
 
 def get_transactions_by_phone(phone_number: str) -> List[Dict]:
@@ -99,15 +221,8 @@ def get_transactions_by_phone(phone_number: str) -> List[Dict]:
     Returns:
         List of transactions for that phone number
     """
-    if not LOG_FILE.exists():
-        return []
-    
-    try:
-        with open(LOG_FILE, 'r') as f:
-            logs = json.load(f)
-        return [log for log in logs if log['phone_number'] == phone_number]
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    with _logs_lock:
+        return [log for log in _logs if log['phone_number'] == phone_number]
 
 
 def get_failed_transactions() -> List[Dict]:
@@ -117,15 +232,8 @@ def get_failed_transactions() -> List[Dict]:
     Returns:
         List of failed transactions
     """
-    if not LOG_FILE.exists():
-        return []
-    
-    try:
-        with open(LOG_FILE, 'r') as f:
-            logs = json.load(f)
-        return [log for log in logs if not log['success']]
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    with _logs_lock:
+        return [log for log in _logs if not log['success']]
 
 
 def get_transaction_summary() -> Dict:
@@ -135,46 +243,36 @@ def get_transaction_summary() -> Dict:
     Returns:
         Dictionary with summary stats
     """
-    if not LOG_FILE.exists():
-        return {
-            "total": 0,
-            "successful": 0,
-            "failed": 0,
-            "by_type": {}
-        }
+    with _logs_lock:
+        total = _stats["total"]
+        successful = _stats["successful"]
+        by_type = dict(_stats["by_type"])
+    failed = total - successful
     
-    try:
-        with open(LOG_FILE, 'r') as f:
-            logs = json.load(f)
-        
-        total = len(logs)
-        successful = sum(1 for log in logs if log['success'])
-        failed = total - successful
-        
-        # Count by type
-        by_type = {}
-        for log in logs:
-            tx_type = log['transaction_type']
-            by_type[tx_type] = by_type.get(tx_type, 0) + 1
-        
-        return {
-            "total": total,
-            "successful": successful,
-            "failed": failed,
-            "by_type": by_type,
-            "success_rate": f"{(successful/total*100):.1f}%" if total > 0 else "N/A"
-        }
-    except (json.JSONDecodeError, FileNotFoundError):
+    if total == 0:
         return {
             "total": 0,
             "successful": 0,
             "failed": 0,
             "by_type": {}
         }
+    
+    return {
+        "total": total,
+        "successful": successful,
+        "failed": failed,
+        "by_type": by_type,
+        "success_rate": f"{(successful/total*100):.1f}%"
+    }
 
 
 def clear_logs() -> None:
     """Clear all transaction logs"""
-    if LOG_FILE.exists():
-        LOG_FILE.unlink()
-    print("Transaction logs cleared")
\ No newline at end of file
+    flush_transactions()
+    with _logs_lock:
+        _logs.clear()
+        _stats.update(total=0, successful=0, by_type={})
+    for path in (LOG_FILE, ROTATED_LOG_FILE, LEGACY_LOG_FILE):
+        if path.exists():
+            path.unlink()
+    logger.info("Transaction logs cleared")
\ No newline at end of file
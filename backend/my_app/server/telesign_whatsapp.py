@@ -14,16 +14,28 @@ Features:
 """
 
 import os
+import re
 import json
+import asyncio
+import atexit
 import datetime
 import hashlib
 import hmac
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Callable
 from enum import Enum
 from pathlib import Path
+from urllib.parse import quote
 from dotenv import load_dotenv
 from telesignenterprise.messaging import MessagingClient
 
+# orjson parses response bodies faster; its JSONDecodeError subclasses json's
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 load_dotenv()
 
 # Load credentials
@@ -64,11 +76,32 @@ class WhatsAppMediaType(Enum):
     DOCUMENT = "document"
 
 
+# Media types that accept a caption
+_CAPTIONABLE_MEDIA = frozenset({WhatsAppMediaType.IMAGE, WhatsAppMediaType.VIDEO})
+
+
+# Shared client: it owns a requests.Session, so reusing it keeps the keep-alive
+# connection to Telesign open between sends instead of a new TLS handshake each time
+_client: Optional[MessagingClient] = None
+_client_lock = threading.Lock()
+
+
 def get_whatsapp_client() -> MessagingClient:
     """Get authenticated Telesign Messaging client for WhatsApp"""
+    global _client
     if not CUSTOMER_ID or not API_KEY:
         raise ValueError("TELESIGN_CUSTOMER_ID and TELESIGN_API_KEY must be set in .env")
-    return MessagingClient(CUSTOMER_ID, API_KEY)
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MessagingClient(CUSTOMER_ID, API_KEY)
+    return _client
+
+
+@atexit.register
+def _close_client():
+    if _client is not None:
+        _client.session.close()
 
 
 def _check_premium_access() -> dict:
@@ -83,32 +116,55 @@ def _check_premium_access() -> dict:
     return None
 
 
+def _parse_body(response) -> dict:
+    """Parsed JSON body of an SDK response, or {} if it has none"""
+    # The SDK already decodes the body into response.json (None if it isn't JSON)
+    if hasattr(response, "json"):
+        return response.json if response.json is not None else {}
+    try:
+        return _loads(response.body) if response.body else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+_UTC = datetime.timezone.utc
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string"""
+    return datetime.datetime.now(_UTC).isoformat()
+
+
+_NON_DIGIT = re.compile(r'\D')
+
+
 def _format_phone_number(phone_number: str) -> str:
     """Format phone number for WhatsApp (E.164 format)"""
     # Remove any whitespace or special characters
-    phone = ''.join(filter(str.isdigit, phone_number))
+    phone = _NON_DIGIT.sub('', phone_number)
     # Ensure it starts with country code
     if not phone.startswith('1') and len(phone) == 10:
         phone = '1' + phone  # Assume US if no country code
     return phone
 
 
-# ==================== TEXT MESSAGES ====================
+# Fields sent with every WhatsApp message; message_type is passed positionally as "ARN"
+_COMMON_PAYLOAD = {"sender_id": WHATSAPP_SENDER_ID}
 
-def send_whatsapp_text(phone_number: str, message: str, preview_url: bool = True) -> dict:
+
+def _send(message_type: str, phone_number: str, payload: dict, message: str = "", **result_fields) -> dict:
     """
-    Send a plain text WhatsApp message
+    Shared send path for the send_whatsapp_* functions
     
     Args:
-        phone_number: Recipient's WhatsApp number (E.164 format)
-        message: Text message content
-        preview_url: Whether to generate link preview for URLs in message
+        message_type: Message type reported in the result (e.g. "text", "template")
+        phone_number: Recipient's WhatsApp number
+        payload: Type-specific Telesign payload fields
+        message: Message text (only used for plain text messages)
+        **result_fields: Extra fields to include in a successful result
     
     Returns:
         dict: Response with reference_id and status
-        
-    Example:
-        >>> send_whatsapp_text("+16025551234", "Hello from Securiva!")
     """
     premium_check = _check_premium_access()
     if premium_check:
@@ -118,27 +174,17 @@ def send_whatsapp_text(phone_number: str, message: str, preview_url: bool = True
     
     try:
         client = get_whatsapp_client()
-        
-        # Telesign WhatsApp API payload
-        payload = {
-            "message": message,
-            "message_type": "ARN",  # Telesign's code for WhatsApp
-            "sender_id": WHATSAPP_SENDER_ID,
-            "preview_url": preview_url
-        }
-        
-        response = client.message(phone_number, message, "ARN", **payload)
-        
-        # Parse response
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
+        response = client.message(phone_number, message, "ARN", **_COMMON_PAYLOAD, **payload)  # ARN: Telesign's code for WhatsApp
+        response_data = _parse_body(response)
         
         return {
             "status_code": response.status_code,
             "reference_id": response_data.get("reference_id"),
             "status": response_data.get("status"),
-            "message_type": "text",
+            "message_type": message_type,
+            **result_fields,
             "recipient": phone_number,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "timestamp": _now_iso(),
             "full_response": response_data
         }
         
@@ -146,10 +192,35 @@ def send_whatsapp_text(phone_number: str, message: str, preview_url: bool = True
         return {
             "status_code": 500,
             "error": str(e),
-            "message_type": "text"
+            "message_type": message_type
         }
 
 
+# ==================== TEXT MESSAGES ====================
+
+def send_whatsapp_text(phone_number: str, message: str, preview_url: bool = True) -> dict:
+    """
+    Send a plain text WhatsApp message
+    
+    Args:
+        phone_number: Recipient's WhatsApp number (E.164 format)
+        message: Text message content
+        preview_url: Whether to generate link preview for URLs in message
+    
+    Returns:
+        dict: Response with reference_id and status
+        
+    Example:
+        >>> send_whatsapp_text("+16025551234", "Hello from Securiva!")
+    """
+    # Telesign WhatsApp API payload
+    payload = {
+        "preview_url": preview_url
+    }
+    
+    return _send("text", phone_number, payload, message=message)
+
+
 # ==================== TEMPLATE MESSAGES ====================
 
 def send_whatsapp_template(
@@ -193,71 +264,41 @@ def send_whatsapp_template(
         ...     parameters=["iPhone 15", "$999"]
         ... )
     """
-    premium_check = _check_premium_access()
-    if premium_check:
-        return premium_check
+    # Build template payload
+    template_payload = {
+        "name": template_name,
+        "language": {"code": language_code},
+        "components": []
+    }
+    
+    # Add header parameters
+    if header_parameters:
+        template_payload["components"].append({
+            "type": "header",
+            "parameters": header_parameters
+        })
+    
+    # Add body parameters
+    if parameters:
+        body_params = [{"type": "text", "text": param} for param in parameters]
+        template_payload["components"].append({
+            "type": "body",
+            "parameters": body_params
+        })
+    
+    # Add button parameters
+    if button_parameters:
+        template_payload["components"].append({
+            "type": "button",
+            "parameters": button_parameters
+        })
     
-    phone_number = _format_phone_number(phone_number)
+    # Full message payload
+    payload = {
+        "template": template_payload
+    }
     
-    try:
-        client = get_whatsapp_client()
-        
-        # Build template payload
-        template_payload = {
-            "name": template_name,
-            "language": {"code": language_code},
-            "components": []
-        }
-        
-        # Add header parameters
-        if header_parameters:
-            template_payload["components"].append({
-                "type": "header",
-                "parameters": header_parameters
-            })
-        
-        # Add body parameters
-        if parameters:
-            body_params = [{"type": "text", "text": param} for param in parameters]
-            template_payload["components"].append({
-                "type": "body",
-                "parameters": body_params
-            })
-        
-        # Add button parameters
-        if button_parameters:
-            template_payload["components"].append({
-                "type": "button",
-                "parameters": button_parameters
-            })
-        
-        # Full message payload
-        payload = {
-            "message_type": "ARN",
-            "sender_id": WHATSAPP_SENDER_ID,
-            "template": template_payload
-        }
-        
-        response = client.message(phone_number, "", "ARN", **payload)
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
-        
-        return {
-            "status_code": response.status_code,
-            "reference_id": response_data.get("reference_id"),
-            "status": response_data.get("status"),
-            "message_type": "template",
-            "template_name": template_name,
-            "recipient": phone_number,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "full_response": response_data
-        }
-        
-    except Exception as e:
-        return {
-            "status_code": 500,
-            "error": str(e),
-            "message_type": "template"
-        }
+    return _send("template", phone_number, payload, template_name=template_name)
 
 
 # ==================== MEDIA MESSAGES ====================
@@ -295,53 +336,33 @@ def send_whatsapp_media(
     if premium_check:
         return premium_check
     
-    phone_number = _format_phone_number(phone_number)
-    
     try:
-        client = get_whatsapp_client()
+        media_value = media_type.value
         
         # Build media payload
-        media_payload = {
-            media_type.value: {
-                "link": media_url
-            }
-        }
+        media_block = {"link": media_url}
         
         # Add caption for image/video
-        if caption and media_type in [WhatsAppMediaType.IMAGE, WhatsAppMediaType.VIDEO]:
-            media_payload[media_type.value]["caption"] = caption
+        if caption and media_type in _CAPTIONABLE_MEDIA:
+            media_block["caption"] = caption
         
         # Add filename for documents
-        if filename and media_type == WhatsAppMediaType.DOCUMENT:
-            media_payload[media_type.value]["filename"] = filename
+        if filename and media_type is WhatsAppMediaType.DOCUMENT:
+            media_block["filename"] = filename
         
         payload = {
-            "message_type": "ARN",
-            "sender_id": WHATSAPP_SENDER_ID,
-            "type": media_type.value,
-            **media_payload
-        }
-        
-        response = client.message(phone_number, "", "ARN", **payload)
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
-        
-        return {
-            "status_code": response.status_code,
-            "reference_id": response_data.get("reference_id"),
-            "status": response_data.get("status"),
-            "message_type": media_type.value,
-            "media_url": media_url,
-            "recipient": phone_number,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "full_response": response_data
+            "type": media_value,
+            media_value: media_block
         }
         
     except Exception as e:
         return {
             "status_code": 500,
             "error": str(e),
-            "message_type": media_type.value
+            "message_type": str(media_type)
         }
+    
+    return _send(media_value, phone_number, payload, media_url=media_url)
 
 
 # ==================== INTERACTIVE MESSAGES ====================
@@ -378,77 +399,47 @@ def send_whatsapp_buttons(
         ...     header_text="Securiva Assistant"
         ... )
     """
-    premium_check = _check_premium_access()
-    if premium_check:
-        return premium_check
-    
     if len(buttons) > 3:
         return {
             "status_code": 400,
             "error": "Maximum 3 buttons allowed for quick reply messages"
         }
     
-    phone_number = _format_phone_number(phone_number)
-    
-    try:
-        client = get_whatsapp_client()
-        
-        # Build interactive payload
-        interactive_payload = {
-            "type": "button",
-            "body": {"text": body_text},
-            "action": {
-                "buttons": [
-                    {
-                        "type": "reply",
-                        "reply": {
-                            "id": btn.get("id", f"btn_{i}"),
-                            "title": btn.get("title", f"Button {i+1}")
-                        }
-                    }
-                    for i, btn in enumerate(buttons)
-                ]
-            }
-        }
-        
-        # Add optional header
-        if header_text:
-            interactive_payload["header"] = {
-                "type": "text",
-                "text": header_text
+    # Build reply buttons; default labels are only formatted when missing
+    reply_buttons = []
+    for i, btn in enumerate(buttons):
+        reply_buttons.append({
+            "type": "reply",
+            "reply": {
+                "id": btn.get("id") or f"btn_{i}",
+                "title": btn.get("title") or f"Button {i+1}"
             }
-        
-        # Add optional footer
-        if footer_text:
-            interactive_payload["footer"] = {"text": footer_text}
-        
-        payload = {
-            "message_type": "ARN",
-            "sender_id": WHATSAPP_SENDER_ID,
-            "type": "interactive",
-            "interactive": interactive_payload
-        }
-        
-        response = client.message(phone_number, "", "ARN", **payload)
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
-        
-        return {
-            "status_code": response.status_code,
-            "reference_id": response_data.get("reference_id"),
-            "status": response_data.get("status"),
-            "message_type": "interactive_buttons",
-            "button_count": len(buttons),
-            "recipient": phone_number,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "full_response": response_data
-        }
-        
-    except Exception as e:
-        return {
-            "status_code": 500,
-            "error": str(e),
-            "message_type": "interactive_buttons"
+        })
+    
+    # Build interactive payload
+    interactive_payload = {
+        "type": "button",
+        "body": {"text": body_text},
+        "action": {"buttons": reply_buttons}
+    }
+    
+    # Add optional header
+    if header_text:
+        interactive_payload["header"] = {
+            "type": "text",
+            "text": header_text
         }
+    
+    # Add optional footer
+    if footer_text:
+        interactive_payload["footer"] = {"text": footer_text}
+    
+    payload = {
+        "type": "interactive",
+        "interactive": interactive_payload
+    }
+    
+    return _send("interactive_buttons", phone_number, payload, button_count=len(buttons))
 
 
 def send_whatsapp_list(
@@ -495,10 +486,6 @@ def send_whatsapp_list(
         ...     ]
         ... )
     """
-    premium_check = _check_premium_access()
-    if premium_check:
-        return premium_check
-    
     # Validate: max 10 sections, max 10 rows per section
     if len(sections) > 10:
         return {
@@ -506,59 +493,33 @@ def send_whatsapp_list(
             "error": "Maximum 10 sections allowed"
         }
     
-    phone_number = _format_phone_number(phone_number)
-    
-    try:
-        client = get_whatsapp_client()
-        
-        # Build list payload
-        interactive_payload = {
-            "type": "list",
-            "body": {"text": body_text},
-            "action": {
-                "button": button_text,
-                "sections": sections
-            }
-        }
-        
-        # Add optional header
-        if header_text:
-            interactive_payload["header"] = {
-                "type": "text",
-                "text": header_text
-            }
-        
-        # Add optional footer
-        if footer_text:
-            interactive_payload["footer"] = {"text": footer_text}
-        
-        payload = {
-            "message_type": "ARN",
-            "sender_id": WHATSAPP_SENDER_ID,
-            "type": "interactive",
-            "interactive": interactive_payload
-        }
-        
-        response = client.message(phone_number, "", "ARN", **payload)
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
-        
-        return {
-            "status_code": response.status_code,
-            "reference_id": response_data.get("reference_id"),
-            "status": response_data.get("status"),
-            "message_type": "interactive_list",
-            "section_count": len(sections),
-            "recipient": phone_number,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "full_response": response_data
+    # Build list payload
+    interactive_payload = {
+        "type": "list",
+        "body": {"text": body_text},
+        "action": {
+            "button": button_text,
+            "sections": sections
         }
-        
-    except Exception as e:
-        return {
-            "status_code": 500,
-            "error": str(e),
-            "message_type": "interactive_list"
+    }
+    
+    # Add optional header
+    if header_text:
+        interactive_payload["header"] = {
+            "type": "text",
+            "text": header_text
         }
+    
+    # Add optional footer
+    if footer_text:
+        interactive_payload["footer"] = {"text": footer_text}
+    
+    payload = {
+        "type": "interactive",
+        "interactive": interactive_payload
+    }
+    
+    return _send("interactive_list", phone_number, payload, section_count=len(sections))
 
 
 # ==================== LOCATION & CONTACTS ====================
@@ -592,52 +553,22 @@ def send_whatsapp_location(
         ...     address="123 Main St, San Francisco, CA"
         ... )
     """
-    premium_check = _check_premium_access()
-    if premium_check:
-        return premium_check
+    location_payload = {
+        "latitude": latitude,
+        "longitude": longitude
+    }
     
-    phone_number = _format_phone_number(phone_number)
+    if name:
+        location_payload["name"] = name
+    if address:
+        location_payload["address"] = address
     
-    try:
-        client = get_whatsapp_client()
-        
-        location_payload = {
-            "latitude": latitude,
-            "longitude": longitude
-        }
-        
-        if name:
-            location_payload["name"] = name
-        if address:
-            location_payload["address"] = address
-        
-        payload = {
-            "message_type": "ARN",
-            "sender_id": WHATSAPP_SENDER_ID,
-            "type": "location",
-            "location": location_payload
-        }
-        
-        response = client.message(phone_number, "", "ARN", **payload)
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
-        
-        return {
-            "status_code": response.status_code,
-            "reference_id": response_data.get("reference_id"),
-            "status": response_data.get("status"),
-            "message_type": "location",
-            "coordinates": f"{latitude},{longitude}",
-            "recipient": phone_number,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "full_response": response_data
-        }
-        
-    except Exception as e:
-        return {
-            "status_code": 500,
-            "error": str(e),
-            "message_type": "location"
-        }
+    payload = {
+        "type": "location",
+        "location": location_payload
+    }
+    
+    return _send("location", phone_number, payload, coordinates=f"{latitude},{longitude}")
 
 
 def send_whatsapp_contact(
@@ -664,46 +595,20 @@ def send_whatsapp_contact(
         ...     }]
         ... )
     """
-    premium_check = _check_premium_access()
-    if premium_check:
-        return premium_check
-    
-    phone_number = _format_phone_number(phone_number)
+    payload = {
+        "type": "contacts",
+        "contacts": contacts
+    }
     
-    try:
-        client = get_whatsapp_client()
-        
-        payload = {
-            "message_type": "ARN",
-            "sender_id": WHATSAPP_SENDER_ID,
-            "type": "contacts",
-            "contacts": contacts
-        }
-        
-        response = client.message(phone_number, "", "ARN", **payload)
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
-        
-        return {
-            "status_code": response.status_code,
-            "reference_id": response_data.get("reference_id"),
-            "status": response_data.get("status"),
-            "message_type": "contacts",
-            "contact_count": len(contacts),
-            "recipient": phone_number,
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "full_response": response_data
-        }
-        
-    except Exception as e:
-        return {
-            "status_code": 500,
-            "error": str(e),
-            "message_type": "contacts"
-        }
+    return _send("contacts", phone_number, payload, contact_count=len(contacts))
 
 
 # ==================== WEBHOOK HANDLING ====================
 
+# Keyed once at import; each verification copies it instead of re-deriving the key pads
+_webhook_hmac = hmac.new(API_KEY.encode(), digestmod=hashlib.sha256) if API_KEY else None
+
+
 def verify_webhook_signature(payload: str, signature: str, timestamp: str) -> bool:
     """
     Verify webhook signature from Telesign
@@ -716,20 +621,21 @@ def verify_webhook_signature(payload: str, signature: str, timestamp: str) -> bo
     Returns:
         bool: True if signature is valid
     """
-    if not API_KEY:
+    if _webhook_hmac is None:
         raise ValueError("API_KEY required for webhook verification")
     
-    # Create signature using HMAC-SHA256
-    message = f"{timestamp}.{payload}"
-    expected_signature = hmac.new(
-        API_KEY.encode(),
-        message.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    # Create signature using HMAC-SHA256, copying the pre-keyed prototype
+    mac = _webhook_hmac.copy()
+    mac.update(f"{timestamp}.{payload}".encode())
+    expected_signature = mac.hexdigest()
     
     return hmac.compare_digest(expected_signature, signature)
 
 
+# Inbound message keys that carry media, in the order they are checked
+_MEDIA_KEYS = ("image", "video", "document", "audio")
+
+
 def parse_inbound_whatsapp_message(webhook_payload: dict) -> dict:
     """
     Parse inbound WhatsApp message from webhook
@@ -741,21 +647,25 @@ def parse_inbound_whatsapp_message(webhook_payload: dict) -> dict:
         dict: Parsed message data
     """
     try:
-        message = webhook_payload.get("message", {})
-        sender = webhook_payload.get("from", {})
+        message = webhook_payload.get("message") or {}
+        sender = webhook_payload.get("from") or {}
+        profile = sender.get("profile")
+        text = message.get("text")
+        button = message.get("button")
+        list_reply = message.get("list_reply")
         
         return {
             "message_id": message.get("id"),
             "sender_phone": sender.get("phone_number"),
-            "sender_name": sender.get("profile", {}).get("name"),
+            "sender_name": profile.get("name") if profile else None,
             "timestamp": message.get("timestamp"),
             "message_type": message.get("type"),
-            "text": message.get("text", {}).get("body"),
-            "media": message.get("image") or message.get("video") or message.get("document") or message.get("audio"),
+            "text": text.get("body") if text else None,
+            "media": next((media for key in _MEDIA_KEYS if (media := message.get(key))), None),
             "location": message.get("location"),
             "contacts": message.get("contacts"),
-            "button_reply": message.get("button", {}).get("text"),
-            "list_reply": message.get("list_reply", {}).get("title"),
+            "button_reply": button.get("text") if button else None,
+            "list_reply": list_reply.get("title") if list_reply else None,
             "full_payload": webhook_payload
         }
     except Exception as e:
@@ -767,6 +677,10 @@ def parse_inbound_whatsapp_message(webhook_payload: dict) -> dict:
 
 # ==================== STATUS & ANALYTICS ====================
 
+# Telesign status codes for a message that is still in flight
+_IN_PROGRESS_CODES = frozenset({290, 295})
+
+
 def get_whatsapp_message_status(reference_id: str) -> dict:
     """
     Get detailed status of a WhatsApp message
@@ -785,18 +699,19 @@ def get_whatsapp_message_status(reference_id: str) -> dict:
         client = get_whatsapp_client()
         response = client.status(reference_id)
         
-        response_data = json.loads(response.body) if isinstance(response.body, str) else response.body
-        status = response_data.get("status", {})
+        response_data = _parse_body(response)
+        status = response_data.get("status") or {}
+        code = status.get("code")
         
         return {
             "status_code": response.status_code,
             "reference_id": reference_id,
             "message_status": status.get("description"),
-            "status_code": status.get("code"),
-            "sent": status.get("code") in [290, 295],  # Message in progress
-            "delivered": status.get("code") == 200,
-            "read": status.get("code") == 203,
-            "failed": status.get("code", 0) >= 400,
+            "message_status_code": code,
+            "sent": code in _IN_PROGRESS_CODES,  # Message in progress
+            "delivered": code == 200,
+            "read": code == 203,
+            "failed": (code or 0) >= 400,
             "timestamp": status.get("updated_on"),
             "error": response_data.get("errors"),
             "full_response": response_data
@@ -810,6 +725,42 @@ def get_whatsapp_message_status(reference_id: str) -> dict:
         }
 
 
+# ==================== BULK SENDING ====================
+
+BULK_CONCURRENCY = 20
+
+
+async def send_whatsapp_bulk(
+    send_fn: Callable[..., dict],
+    rows: List[Dict[str, Any]],
+    concurrency: int = BULK_CONCURRENCY
+) -> List[dict]:
+    """
+    Run one of the send_whatsapp_* functions for many recipients concurrently
+    
+    Args:
+        send_fn: Send function to call, e.g. send_whatsapp_text
+        rows: Keyword arguments for each call
+        concurrency: Maximum number of sends in flight at once
+    
+    Returns:
+        list: send_fn results, in the same order as rows
+        
+    Example:
+        >>> await send_whatsapp_bulk(send_whatsapp_text, [
+        ...     {"phone_number": "+16025551234", "message": "Hi Ann"},
+        ...     {"phone_number": "+16025555678", "message": "Hi Bob"}
+        ... ])
+    """
+    sem = asyncio.Semaphore(concurrency)
+    
+    async def _one(row):
+        async with sem:
+            return await asyncio.to_thread(send_fn, **row)
+    
+    return await asyncio.gather(*(_one(row) for row in rows))
+
+
 # ==================== UTILITY FUNCTIONS ====================
 
 def create_whatsapp_link(phone_number: str, message: Optional[str] = None) -> str:
@@ -827,7 +778,6 @@ def create_whatsapp_link(phone_number: str, message: Optional[str] = None) -> st
     base_url = f"https://wa.me/{phone}"
     
     if message:
-        from urllib.parse import quote
         base_url += f"?text={quote(message)}"
     
     return base_url
@@ -1,18 +1,53 @@
 import jwt
 import os
+import time
 from mcp.server.auth.provider import AccessToken, TokenVerifier
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 if not JWT_SECRET_KEY:
     raise ValueError("No JWT_SECRET_KEY set for the token verifier. Please set it in your .env file.")
 
+# Built once instead of per verify_token call
+_JWT_KEY = JWT_SECRET_KEY.encode()
+_JWT_ALGORITHMS = ["HS256"]
+_JWT_OPTIONS = {"verify_signature": True, "require": ["exp"]}
+_JWT_DECODER = jwt.PyJWT()
+
+# Verified tokens -> (client_id, sub, exp). Clients resend the same bearer token on
+# every request, so a hit skips the HMAC check and JSON parse until the token expires.
+TOKEN_CACHE_TTL = 60  # seconds
+TOKEN_CACHE_MAX = 4096
+_token_cache: dict[str, tuple[str | None, str | None, float, float]] = {}
+
+
+def _cache_token(token: str, payload: dict):
+    now = time.monotonic()
+    if len(_token_cache) >= TOKEN_CACHE_MAX:
+        for key in [k for k, v in _token_cache.items() if v[3] <= now]:
+            del _token_cache[key]
+        if len(_token_cache) >= TOKEN_CACHE_MAX:
+            _token_cache.clear()
+    _token_cache[token] = (
+        payload.get('client_id'), payload.get('sub'), payload['exp'], now + TOKEN_CACHE_TTL
+    )
+
 class SimpleTokenVerifier(TokenVerifier):
     """Verifies a JWT token."""
 
     async def verify_token(self, token: str) -> AccessToken | None:
         """Verifies the token. Returns an AccessToken if valid, otherwise None."""
+        cached = _token_cache.get(token)
+        if cached:
+            client_id, subject, exp, cached_until = cached
+            if time.monotonic() < cached_until and time.time() < exp:
+                return AccessToken(client_id=client_id, subject=subject, token=token, scopes=["user"])
+            _token_cache.pop(token, None)
+
         try:
-            payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=["HS256"])
+            payload = _JWT_DECODER.decode(
+                token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_OPTIONS
+            )
+            _cache_token(token, payload)
 
             return AccessToken(
                 client_id=payload.get('client_id'), 
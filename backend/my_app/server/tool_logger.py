@@ -1,10 +1,510 @@
+import atexit
+import gzip
 import json
 import logging
 import os
-from datetime import datetime
+import queue
+import random
+import shutil
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+# orjson encodes straight to bytes and parses faster; fall back to compact stdlib json
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which orjson refuses
+            return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+    def _canonical(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+        except (orjson.JSONEncodeError, TypeError):
+            return json.dumps(obj, sort_keys=True, default=str).encode()
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+    def _canonical(obj) -> bytes:
+        return json.dumps(obj, sort_keys=True, default=str).encode()
+
+    _loads = json.loads
+
+# Stable 64-bit fingerprint of a call's arguments, unlike hash() which is
+# salted per process
+try:
+    import xxhash
+
+    def _fingerprint(data: bytes) -> int:
+        return xxhash.xxh64_intdigest(data)
+except ImportError:
+    import hashlib
+
+    def _fingerprint(data: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+# Results longer than this are truncated in the JSON log
+RESULT_MAX_CHARS = 1000
+
+# Once the JSON log passes this size it is renamed to a numbered segment
+# (tool_calls.json.1, .2, ...) and compressed in the background
+JSON_LOG_MAX_BYTES = 256 << 20
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# One worker, so segments are compressed in order and never compete with each other
+_compress_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool-log-compress")
+
+
+def _compress_segment(path: Path):
+    """Compress a rotated segment to .zst (or .gz without zstandard), then delete it."""
+    suffix = ".zst" if zstandard is not None else ".gz"
+    target = path.with_name(path.name + suffix)
+    partial = target.with_name(target.name + ".part")
+    with open(path, "rb") as src:
+        if zstandard is not None:
+            with open(partial, "wb") as dst:
+                zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+        else:
+            with gzip.open(partial, "wb", compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+    os.replace(partial, target)
+    path.unlink()
+
+
+# Records waiting for the writer thread; when full, new records are dropped
+# rather than blocking the tool call that produced them
+LOG_QUEUE_MAX = 10_000
+
+
+def _is_json_record(record: logging.LogRecord) -> bool:
+    return hasattr(record, "json_payload")
+
+
+def _is_text_record(record: logging.LogRecord) -> bool:
+    return not hasattr(record, "json_payload")
+
+
+def _tail_lines(path: Path, limit: int, block_size: int = 65536) -> list:
+    """Last `limit` non-empty lines of a file, read backwards from the end in blocks."""
+    lines = []
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0 and len(lines) < limit:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            parts = (f.read(step) + partial).split(b"\n")
+            # The first piece may continue in the previous block
+            partial = parts[0]
+            lines[:0] = [line for line in parts[1:] if line.strip()]
+        if pos == 0 and partial.strip():
+            lines.insert(0, partial)
+    return lines[-limit:] if limit > 0 else []
+
+
+class _LogWriter:
+    """
+    Background thread that owns the log handlers.
+
+    Each pass drains everything queued, hands it to the handlers, then flushes
+    each handler once (end of batch) instead of once per record. When the
+    queue is full, new records are dropped and counted instead of blocking
+    the tool call that produced them.
+    """
+
+    _STOP = object()
+
+    def __init__(self, handlers: list, maxsize: int = LOG_QUEUE_MAX):
+        self.handlers = handlers
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        # Records accepted / written so far, for flush()
+        self._enqueued = 0
+        self._written = 0
+        self._progress = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="tool-log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, record: logging.LogRecord) -> bool:
+        """Queue a record without blocking; returns False if it was dropped"""
+        with self._progress:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._enqueued += 1
+        return True
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            stop = False
+            # Only handlers that took a record are flushed, so an idle console
+            # handler never touches its stream
+            used = set()
+            for record in batch:
+                if record is self._STOP:
+                    stop = True
+                    continue
+                for i, handler in enumerate(self.handlers):
+                    if record.levelno >= handler.level:
+                        self._call(handler.handle, record)
+                        used.add(i)
+            for i in sorted(used):
+                self._call(self.handlers[i].flush)
+
+            # Only now are the records on disk, which is what flush() waits for
+            with self._progress:
+                self._written += sum(record is not self._STOP for record in batch)
+                self._progress.notify_all()
+            if stop:
+                break
+
+    @staticmethod
+    def _call(func, *args):
+        try:
+            func(*args)
+        except Exception:
+            # Report like Handler.handleError, but keep the thread alive
+            if logging.raiseExceptions:
+                traceback.print_exc()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything queued before this call has been written.
+
+        Returns False if that didn't happen within timeout seconds, or if the
+        writer thread is no longer running.
+        """
+        with self._progress:
+            target = self._enqueued
+            return self._progress.wait_for(
+                lambda: self._written >= target or not self._thread.is_alive(),
+                timeout,
+            ) and self._written >= target
+
+    def stop(self, timeout: float = 5.0):
+        """Write what is queued, then end the thread and close the handlers. Later calls do nothing."""
+        with self._progress:
+            if self._stopped:
+                return
+            self._stopped = True
+        if self._thread.is_alive():
+            try:
+                self._queue.put(self._STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        if not self._thread.is_alive():
+            for handler in self.handlers:
+                handler.close()
+
+
+class _WriterHandler(QueueHandler):
+    """QueueHandler that feeds a _LogWriter, which counts drops instead of reporting each one"""
+
+    def __init__(self, writer: _LogWriter):
+        super().__init__(None)
+        self.writer = writer
+
+    def enqueue(self, record: logging.LogRecord):
+        self.writer.put(record)
+
+
+class _BatchedFileHandler(logging.Handler):
+    """
+    Text-log handler that appends each writer batch with a single os.write.
+
+    With O_APPEND every batch lands whole, so lines from other worker
+    processes sharing the file can sit between batches but never inside one.
+    """
+
+    terminator = "\n"
+
+    def __init__(self, path: Path, encoding: str = "utf-8"):
+        super().__init__()
+        self.encoding = encoding
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._pending: list = []
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            os.write(self._fd, "".join(pending).encode(self.encoding))
+
+    def close(self):
+        with self.lock:
+            if self._fd is None:
+                return
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+        super().close()
+
+
+class _TextFormatter(logging.Formatter):
+    """Text-log formatter that reuses the timestamp already built for the JSON entry"""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        cached = getattr(record, "cached_ts", None)
+        if cached is not None:
+            return cached
+        usec = int(record.created * 1_000_000) % 1_000_000
+        return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created))}.{usec:06d}"
+
+
+class _JsonLinesHandler(logging.Handler):
+    """
+    Appends each record's json_payload to the JSON log, one object per line.
+
+    Also keeps a session index: each entry's byte range is recorded in a sidecar
+    .idx file, so one session's entries can be read without scanning the whole
+    log. The in-memory copy is built only from the .idx file and caught up
+    before each lookup, so it also sees entries written by other processes.
+
+    Past max_bytes the log is rotated to a numbered segment that is compressed
+    in the background. The index only covers the current file, so session
+    lookups and recent-log reads see just the current segment.
+    """
+
+    # Lines buffered before an early flush; otherwise the writer flushes
+    # once at the end of each batch
+    FLUSH_EVERY = 64
+
+    def __init__(self, path: Path, max_bytes: int = JSON_LOG_MAX_BYTES):
+        super().__init__()
+        self.path = path
+        self.index_path = path.with_suffix(".idx")
+        self.max_bytes = max_bytes
+        self.addFilter(_is_json_record)
+        self._pending: list = []
+        self._open()
+
+    def _open(self):
+        self._sessions: Dict[str, list] = {}
+        # How far into the .idx file _sessions reflects
+        self._index_pos = 0
+        self._load_index()
+        # O_APPEND makes each batch a single atomic append, even with other writers
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        self._fd = os.open(self.path, flags, 0o644)
+        self._index_fd = os.open(self.index_path, flags, 0o644)
+
+    def _reopen(self):
+        os.close(self._fd)
+        os.close(self._index_fd)
+        self._open()
+
+    def _reopen_if_rotated(self):
+        """Follow a rotation done by another process sharing the log"""
+        try:
+            current = os.stat(self.path)
+        except FileNotFoundError:
+            self._reopen()
+            return
+        if current.st_ino != os.fstat(self._fd).st_ino:
+            self._reopen()
+
+    def _rotate(self):
+        """Move the log to the next numbered segment and queue it for compression"""
+        prefix = self.path.name + "."
+        numbers = [
+            int(number)
+            for number in (p.name[len(prefix):].split(".")[0] for p in self.path.parent.glob(prefix + "*"))
+            if number.isdigit()
+        ]
+        segment = self.path.with_name(f"{self.path.name}.{max(numbers, default=0) + 1}")
+        os.replace(self.path, segment)
+        self.index_path.unlink(missing_ok=True)
+        self._reopen()
+        _compress_executor.submit(_compress_segment, segment)
+
+    def _load_index(self):
+        """Load the session index, rebuilding it from the log if it is missing"""
+        if not self.path.exists():
+            self.index_path.unlink(missing_ok=True)
+            return
+        if self.index_path.exists():
+            self._read_new_index()
+            return
+
+        index_lines = []
+        offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    session_id = _loads(line).get("session_id")
+                except (ValueError, AttributeError):
+                    session_id = None
+                if session_id is not None:
+                    index_lines.append(_dumps([session_id, offset, len(line)]) + b"\n")
+                offset += len(line)
+        with open(self.index_path, "wb") as f:
+            f.writelines(index_lines)
+        self._read_new_index()
+
+    def _read_new_index(self):
+        """Fold in index lines appended since the last read, by any process"""
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_pos)
+            data = f.read()
+        # Stop at the last newline in case another process's append is mid-read
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            try:
+                session_id, offset, length = _loads(line)
+            except (ValueError, TypeError):
+                continue
+            self._sessions.setdefault(session_id, []).append((offset, length))
+        self._index_pos += end
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            payload = _dumps(record.json_payload) + b"\n"
+            self._pending.append((record.json_payload.get("session_id"), payload))
+            if len(self._pending) >= self.FLUSH_EVERY:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def session_ranges(self, session_id: str) -> list:
+        """(offset, length) of each logged entry for a session, in write order"""
+        with self.lock:
+            self._reopen_if_rotated()
+            self._read_new_index()
+            return list(self._sessions.get(session_id, ()))
+
+    def flush(self):
+        """Write the pending lines with one os.write, then index where they landed"""
+        with self.lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            data = b"".join(payload for _, payload in pending)
+            self._reopen_if_rotated()
+            os.write(self._fd, data)
+            # After an O_APPEND write the fd sits at the end of our own batch
+            offset = os.lseek(self._fd, 0, os.SEEK_CUR) - len(data)
+            index_lines = []
+            for session_id, payload in pending:
+                index_lines.append(_dumps([session_id, offset, len(payload)]) + b"\n")
+                offset += len(payload)
+            os.write(self._index_fd, b"".join(index_lines))
+            if offset > self.max_bytes:
+                self._rotate()
+
+    def close(self):
+        with self.lock:
+            if self._fd is None:
+                return
+            self.flush()
+            os.close(self._fd)
+            os.close(self._index_fd)
+            self._fd = self._index_fd = None
+        super().close()
+
+
+# Handler pipelines already running, by log directory. Instances sharing a
+# directory reuse its files and writer thread instead of opening new ones.
+_pipelines: Dict[Path, tuple] = {}
+_pipelines_lock = threading.Lock()
+# Pipelines ever installed, so child logger names are never reused
+_pipelines_started = 0
+
+
+def _install_handlers(log_dir: Path, text_path: Path, json_path: Path) -> tuple:
+    """Return (logger, writer, json handler) for log_dir, starting its writer the first time."""
+    global _pipelines_started
+    key = log_dir.resolve()
+    with _pipelines_lock:
+        if key in _pipelines:
+            return _pipelines[key]
+        _pipelines_started += 1
+
+        # The first directory gets the ToolCallLogger logger itself; any other
+        # gets a child that doesn't propagate into the first one's handlers
+        logger = logging.getLogger("ToolCallLogger")
+        if _pipelines:
+            logger = logger.getChild(f"dir{_pipelines_started}")
+            logger.propagate = False
+        logger.setLevel(logging.INFO)
+
+        # File handler for human-readable logs
+        file_handler = _BatchedFileHandler(text_path)
+        file_handler.setLevel(logging.INFO)
+        file_handler.addFilter(_is_text_record)
+        file_formatter = _TextFormatter('%(asctime)s - %(levelname)s - %(message)s')
+        file_handler.setFormatter(file_formatter)
+
+        # Console handler for real-time visibility. Every call is echoed only on an
+        # interactive terminal (or with TOOL_LOG_CONSOLE=1); otherwise just failures.
+        console_handler = logging.StreamHandler()
+        interactive = sys.stderr.isatty() or os.getenv("TOOL_LOG_CONSOLE") == "1"
+        console_handler.setLevel(logging.INFO if interactive else logging.WARNING)
+        console_formatter = logging.Formatter(
+            '🔧 [TOOL] %(message)s'
+        )
+        console_handler.setFormatter(console_formatter)
+        console_handler.addFilter(_is_text_record)
+
+        # Callers only enqueue records; the writer thread owns the handlers
+        # and does the file and console I/O
+        json_handler = _JsonLinesHandler(json_path)
+        writer = _LogWriter([file_handler, console_handler, json_handler])
+        atexit.register(writer.stop)
+        logger.addHandler(_WriterHandler(writer))
+
+        _pipelines[key] = (logger, writer, json_handler)
+        return _pipelines[key]
+
+
+def _uninstall_handlers(log_dir: Path):
+    """Stop log_dir's writer and detach its pipeline, e.g. when a test's directory goes away"""
+    with _pipelines_lock:
+        pipeline = _pipelines.pop(Path(log_dir).resolve(), None)
+    if pipeline is None:
+        return
+    logger, writer, _ = pipeline
+    for handler in [h for h in logger.handlers if isinstance(h, _WriterHandler) and h.writer is writer]:
+        logger.removeHandler(handler)
+    writer.stop()
+
 
 class ToolCallLogger:
     """
@@ -12,8 +512,29 @@ class ToolCallLogger:
     Logs are stored in backend/logs/ directory.
     """
 
+    # Identical entries (same session, tool, arguments, result, error and
+    # metadata) within this many seconds are collapsed; the next logged one
+    # carries a repeat_count
+    DEDUP_WINDOW = 5.0
+    DEDUP_MAX = 1024
+
+    # Longest get_recent_logs/get_session_logs wait for queued entries
+    READ_FLUSH_TIMEOUT = 0.5
+
     def __init__(self, enabled: bool = True, log_dir: str = None):
         self.enabled = enabled
+        self._recent_calls: OrderedDict = OrderedDict()
+        self._recent_lock = threading.Lock()
+        self._ts_cache = (0, "")
+
+        # TOOL_LOG_SAMPLE=0.1 keeps 10% of successful calls; errors are always logged
+        try:
+            self._sample_rate = min(max(float(os.getenv("TOOL_LOG_SAMPLE", "1.0")), 0.0), 1.0)
+        except ValueError:
+            self._sample_rate = 1.0
+        # Successes skipped by sampling, per tool; reported by stats(), not logged
+        self._sampled_out: Counter = Counter()
+        self._sampled_lock = threading.Lock()
 
         # Set up log directory
         if log_dir is None:
@@ -31,31 +552,9 @@ class ToolCallLogger:
         self.json_log_path = log_dir / "tool_calls.json"
         self.text_log_path = log_dir / "tool_calls.log"
 
-        # Set up text logger
-        self.logger = logging.getLogger("ToolCallLogger")
-        self.logger.setLevel(logging.INFO)
-
-        # Remove existing handlers to avoid duplicates
-        self.logger.handlers.clear()
-
-        # File handler for human-readable logs
-        file_handler = logging.FileHandler(self.text_log_path)
-        file_handler.setLevel(logging.INFO)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(file_handler)
-
-        # Console handler for real-time visibility
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_formatter = logging.Formatter(
-            '🔧 [TOOL] %(message)s'
+        self.logger, self._writer, self._json_handler = _install_handlers(
+            log_dir, self.text_log_path, self.json_log_path
         )
-        console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
 
     def log_tool_call(
         self,
@@ -82,7 +581,21 @@ class ToolCallLogger:
         if not self.enabled:
             return
 
-        timestamp = datetime.utcnow().isoformat()
+        if self._sample_rate < 1.0 and not error and random.random() >= self._sample_rate:
+            with self._sampled_lock:
+                self._sampled_out[tool_name] += 1
+            return
+
+        result_str = "" if result is None else str(result)
+        arg_hash = _fingerprint(_canonical(arguments))
+        # Only fully identical entries collapse: a "started" entry and the
+        # "result" entry logged for the same arguments right after both stay
+        outcome_hash = _fingerprint(_canonical([result is None, result_str, metadata]))
+        repeats = self._collapse_repeat(session_id, tool_name, error, (arg_hash, outcome_hash))
+        if repeats is None:
+            return
+
+        timestamp = self._iso_now()
         status = "error" if error else "success"
 
         # Create log entry
@@ -91,15 +604,15 @@ class ToolCallLogger:
             "session_id": session_id,
             "tool_name": tool_name,
             "arguments": arguments,
+            "arg_hash": arg_hash,
             "status": status,
             "duration_ms": duration_ms,
         }
 
         if result is not None:
             # Truncate large results for JSON log
-            result_str = str(result)
-            if len(result_str) > 1000:
-                log_entry["result"] = result_str[:1000] + "... (truncated)"
+            if len(result_str) > RESULT_MAX_CHARS:
+                log_entry["result"] = result_str[:RESULT_MAX_CHARS] + "... (truncated)"
                 log_entry["result_length"] = len(result_str)
             else:
                 log_entry["result"] = result_str
@@ -110,14 +623,16 @@ class ToolCallLogger:
         if metadata:
             log_entry["metadata"] = metadata
 
-        # Write to JSON log (one JSON object per line for easy parsing)
-        try:
-            with open(self.json_log_path, "a") as f:
-                f.write(json.dumps(log_entry, default=str) + "\n")
-        except Exception as e:
-            self.logger.error(f"Failed to write JSON log: {e}")
+        if repeats:
+            log_entry["repeat_count"] = repeats
+
+        # Queue for the JSON log (one JSON object per line for easy parsing)
+        self._enqueue_json(log_entry)
+
+        # Write human-readable log, skipping the formatting if nothing would emit it
+        if not self.logger.isEnabledFor(logging.ERROR if error else logging.INFO):
+            return
 
-        # Write human-readable log
         duration_str = f"{duration_ms:.2f}ms" if duration_ms else "N/A"
         args_str = json.dumps(arguments, indent=2, default=str) if arguments else "{}"
 
@@ -125,16 +640,77 @@ class ToolCallLogger:
             self.logger.error(
                 f"Tool '{tool_name}' FAILED | Session: {session_id} | Duration: {duration_str}\n"
                 f"  Arguments: {args_str}\n"
-                f"  Error: {error}"
+                f"  Error: {error}",
+                extra={"cached_ts": timestamp}
             )
         else:
-            result_preview = str(result)[:200] if result else "No result"
+            result_preview = result_str[:200] if result else "No result"
             self.logger.info(
                 f"Tool '{tool_name}' SUCCESS | Session: {session_id} | Duration: {duration_str}\n"
                 f"  Arguments: {args_str}\n"
-                f"  Result: {result_preview}{'...' if result and len(str(result)) > 200 else ''}"
+                f"  Result: {result_preview}{'...' if result and len(result_str) > 200 else ''}",
+                extra={"cached_ts": timestamp}
             )
 
+    def _enqueue_json(self, entry: Dict[str, Any]):
+        """Hand an entry to the writer for the JSON log, dropping it if the queue is full"""
+        self._writer.put(logging.makeLogRecord({"levelno": logging.INFO, "json_payload": entry}))
+
+    def _iso_now(self) -> str:
+        """Current UTC time as ISO 8601 with microseconds; the date part is formatted once per second."""
+        sec, usec = divmod(time.time_ns() // 1000, 1_000_000)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+            self._ts_cache = (sec, prefix)
+        return f"{prefix}.{usec:06d}"
+
+    def _collapse_repeat(self, session_id, tool_name, error, fingerprint) -> Optional[int]:
+        """
+        Track identical entries within DEDUP_WINDOW.
+
+        Returns None if this call repeats one logged moments ago and should be
+        skipped, otherwise the number of repeats skipped since the last one.
+        """
+        key = (session_id, tool_name, error, fingerprint)
+        now = time.monotonic()
+        with self._recent_lock:
+            seen = self._recent_calls.get(key)
+            if seen and now - seen[0] < self.DEDUP_WINDOW:
+                seen[1] += 1
+                return None
+            self._recent_calls[key] = [now, 0]
+            self._recent_calls.move_to_end(key)
+            if len(self._recent_calls) > self.DEDUP_MAX:
+                self._recent_calls.popitem(last=False)
+        return seen[1] if seen else 0
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait up to timeout seconds for every queued record to be written.
+
+        Returns:
+            bool: False if records were still pending when it gave up
+        """
+        return self._writer.flush(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counts of entries that never reached the log.
+
+        Returns:
+            Dict with "sample_rate", "sampled_out" (successes skipped by
+            sampling, per tool) and "dropped" (records dropped because the
+            writer queue was full; shared by loggers on the same directory)
+        """
+        with self._sampled_lock:
+            sampled_out = dict(self._sampled_out)
+        return {
+            "sample_rate": self._sample_rate,
+            "sampled_out": sampled_out,
+            "dropped": self._writer.dropped,
+        }
+
     def get_recent_logs(self, limit: int = 100) -> list:
         """
         Retrieve recent tool call logs from JSON file.
@@ -145,18 +721,18 @@ class ToolCallLogger:
         Returns:
             List of log entries (most recent first)
         """
+        # Pick up entries still queued, but never wait long: whatever is
+        # already on disk is returned if the writer is behind or has stopped
+        self.flush(self.READ_FLUSH_TIMEOUT)
         if not self.json_log_path.exists():
             return []
 
         try:
-            logs = []
-            with open(self.json_log_path, "r") as f:
-                for line in f:
-                    if line.strip():
-                        logs.append(json.loads(line))
+            # Only the tail of the file is read, however large the log has grown
+            logs = [_loads(line) for line in _tail_lines(self.json_log_path, limit)]
 
             # Return most recent first
-            return logs[-limit:][::-1]
+            return logs[::-1]
         except Exception as e:
             self.logger.error(f"Failed to read logs: {e}")
             return []
@@ -171,18 +747,18 @@ class ToolCallLogger:
         Returns:
             List of log entries for the session
         """
+        # Pick up entries still queued, but never wait long: whatever is
+        # already on disk is returned if the writer is behind or has stopped
+        self.flush(self.READ_FLUSH_TIMEOUT)
         if not self.json_log_path.exists():
             return []
 
         try:
-            logs = []
-            with open(self.json_log_path, "r") as f:
-                for line in f:
-                    if line.strip():
-                        log_entry = json.loads(line)
-                        if log_entry.get("session_id") == session_id:
-                            logs.append(log_entry)
-            return logs
+            # Read just this session's entries, located through the session index
+            ranges = self._json_handler.session_ranges(session_id)
+            with open(self.json_log_path, "rb") as f:
+                fd = f.fileno()
+                return [_loads(os.pread(fd, length, offset)) for offset, length in ranges]
         except Exception as e:
             self.logger.error(f"Failed to read session logs: {e}")
             return []
@@ -190,14 +766,17 @@ class ToolCallLogger:
 
 # Create global logger instance
 _logger_instance = None
+_logger_lock = threading.Lock()
 
 
 def get_tool_logger() -> ToolCallLogger:
     """Get or create the global ToolCallLogger instance."""
     global _logger_instance
     if _logger_instance is None:
-        enabled = os.getenv("ENABLE_TOOL_LOGGING", "true").lower() == "true"
-        _logger_instance = ToolCallLogger(enabled=enabled)
+        with _logger_lock:
+            if _logger_instance is None:
+                enabled = os.getenv("ENABLE_TOOL_LOGGING", "true").lower() == "true"
+                _logger_instance = ToolCallLogger(enabled=enabled)
     return _logger_instance
 
 
@@ -1,36 +1,28 @@
 """
-Create a test user in oauth.json for Salesforce testing
+Create a test user in the OAuth store for Salesforce testing
 This allows you to test Salesforce without going through Google OAuth
 
 Usage: uv run python tests/create_test_user_for_salesforce.py
 """
 
-import json
+import sys
 import uuid
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from my_app.server.salesforce_utils import load_oauth_data, get_user, save_oauth_user
+
 
 def create_test_user():
-    """Create a test user entry in oauth.json"""
+    """Create a test user entry in the OAuth store"""
     
-    oauth_file = Path(__file__).parent.parent / "my_app" / "server" / "oauth.json"
-    
-    # Load existing data or create new
-    if oauth_file.exists():
-        with open(oauth_file, "r") as f:
-            data = json.load(f)
-    else:
-        data = {"users": []}
+    data = load_oauth_data()
     
     # Check if test user already exists
     test_user_id = "test_user_123"
-    existing_user = None
-    
-    for user in data.get("users", []):
-        if user.get("user_id") == test_user_id:
-            existing_user = user
-            break
+    existing_user = get_user(test_user_id, data)
     
     if existing_user:
         print(f"✅ Test user already exists: {test_user_id}")
@@ -78,17 +70,15 @@ def create_test_user():
     
     data["users"].append(test_user)
     
-    # Write to oauth.json
-    with open(oauth_file, "w") as f:
-        json.dump(data, f, indent=2)
+    # Write just this user to the OAuth store
+    save_oauth_user(data, test_user)
     
     print("=" * 70)
-    print("✅ Created test user in oauth.json")
+    print("✅ Created test user in the OAuth store")
     print("=" * 70)
     print(f"User ID: {test_user_id}")
     print(f"Email: test@example.com")
     print(f"API Key: test_api_key_abc123")
-    print(f"File: {oauth_file}")
     
     print("\n" + "=" * 70)
     print("Next Steps:")
@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+from my_app.server import api_key_manager
+
+
+class ApiKeyCacheTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(api_key_manager._api_key_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeat_lookup_uses_cache(self):
+        with mock.patch.object(api_key_manager, "validate_api_key", return_value="u1") as validate:
+            self.assertEqual(api_key_manager.validate_api_key_cached("sk_live_a"), "u1")
+            self.assertEqual(api_key_manager.validate_api_key_cached("sk_live_a"), "u1")
+
+        validate.assert_called_once_with("sk_live_a")
+
+    def test_invalid_key_is_not_cached(self):
+        with mock.patch.object(api_key_manager, "validate_api_key", return_value=None) as validate:
+            api_key_manager.validate_api_key_cached("sk_live_bad")
+            api_key_manager.validate_api_key_cached("sk_live_bad")
+
+        self.assertEqual(validate.call_count, 2)
+
+    def test_expired_entry_is_revalidated(self):
+        with mock.patch.object(api_key_manager, "validate_api_key", return_value="u1") as validate, \
+                mock.patch.object(api_key_manager.time, "monotonic", side_effect=[0, 61]):
+            api_key_manager.validate_api_key_cached("sk_live_a")
+            api_key_manager.validate_api_key_cached("sk_live_a")
+
+        self.assertEqual(validate.call_count, 2)
+
+
+class ApiKeyInvalidationTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(api_key_manager._api_key_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.api_key = "sk_live_a"
+        self.data = {"users": [{
+            "user_id": "u1",
+            "api_key": {"key_hash": api_key_manager.hash_api_key(self.api_key), "last_used": None},
+        }]}
+
+        def get_user_by_key_hash(key_hash, data):
+            for user in data["users"]:
+                if (user.get("api_key") or {}).get("key_hash") == key_hash:
+                    return user
+            return None
+
+        for name, value in {
+            "load_oauth_data": mock.Mock(return_value=self.data),
+            "save_oauth_data": mock.Mock(),
+            "save_oauth_user": mock.Mock(),
+            "get_user_by_key_hash": get_user_by_key_hash,
+        }.items():
+            patcher = mock.patch(f"my_app.server.salesforce_utils.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_revoked_key_is_rejected_immediately(self):
+        self.assertEqual(api_key_manager.validate_api_key_cached(self.api_key), "u1")
+
+        self.assertTrue(api_key_manager.revoke_api_key("u1"))
+
+        self.assertIsNone(api_key_manager.validate_api_key_cached(self.api_key))
+
+    def test_replaced_key_is_rejected_immediately(self):
+        self.assertEqual(api_key_manager.validate_api_key_cached(self.api_key), "u1")
+
+        api_key_manager.store_api_key("u1", "sk_live_b")
+
+        self.assertIsNone(api_key_manager.validate_api_key_cached(self.api_key))
+        self.assertEqual(api_key_manager.validate_api_key_cached("sk_live_b"), "u1")
+
+    def test_other_users_stay_cached(self):
+        api_key_manager._api_key_cache[b"other"] = ("u2", float("inf"))
+
+        api_key_manager.invalidate_api_key_cache("u1")
+
+        self.assertIn(b"other", api_key_manager._api_key_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from unittest import mock
+
+from my_app.server import salesforce_app
+
+
+class RefreshBackoffTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(salesforce_app._refresh_failures, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def oauth_data(self, refresh_token="rt1", issued_at=0):
+        return {"users": [{
+            "user_id": "u1",
+            "services": {"salesforce": {"credentials": {"refresh_token": refresh_token, "issued_at": issued_at}}},
+        }]}
+
+    def test_stale_token_is_due(self):
+        self.assertEqual(salesforce_app._users_due_for_refresh(self.oauth_data(), 0), [("u1", "rt1")])
+
+    def test_fresh_token_is_not_due(self):
+        data = self.oauth_data(issued_at=int(salesforce_app.time.time() * 1000))
+
+        self.assertEqual(salesforce_app._users_due_for_refresh(data, 0), [])
+
+    def test_failed_user_is_skipped_with_growing_backoff(self):
+        interval = salesforce_app.REFRESH_INTERVAL
+        with mock.patch.object(salesforce_app, "log"):
+            salesforce_app._record_refresh_result("u1", "rt1", False, 0)
+            self.assertEqual(salesforce_app._users_due_for_refresh(self.oauth_data(), interval - 1), [])
+            self.assertEqual(len(salesforce_app._users_due_for_refresh(self.oauth_data(), interval)), 1)
+
+            salesforce_app._record_refresh_result("u1", "rt1", False, interval)
+            self.assertEqual(salesforce_app._users_due_for_refresh(self.oauth_data(), 3 * interval - 1), [])
+            self.assertEqual(len(salesforce_app._users_due_for_refresh(self.oauth_data(), 3 * interval)), 1)
+
+    def test_backoff_is_capped(self):
+        with mock.patch.object(salesforce_app, "log"):
+            for _ in range(30):
+                salesforce_app._record_refresh_result("u1", "rt1", False, 0)
+
+        self.assertEqual(salesforce_app._refresh_failures["u1"][2], salesforce_app.REFRESH_BACKOFF_MAX)
+
+    def test_new_login_clears_backoff(self):
+        with mock.patch.object(salesforce_app, "log"):
+            salesforce_app._record_refresh_result("u1", "rt1", False, 0)
+
+        self.assertEqual(salesforce_app._users_due_for_refresh(self.oauth_data("rt2"), 1), [("u1", "rt2")])
+
+    def test_success_clears_backoff(self):
+        with mock.patch.object(salesforce_app, "log"):
+            salesforce_app._record_refresh_result("u1", "rt1", False, 0)
+        salesforce_app._record_refresh_result("u1", "rt1", True, 1)
+
+        self.assertEqual(salesforce_app._refresh_failures, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
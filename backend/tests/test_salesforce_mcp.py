@@ -25,23 +25,17 @@ def test_salesforce_connection():
     print("SALESFORCE MCP TOOLS TEST")
     print("=" * 60)
     
-    # Load oauth.json
-    oauth_path = Path(__file__).parent.parent / "my_app" / "server" / "oauth.json"
-    
-    if not oauth_path.exists():
-        print("\n❌ Error: oauth.json not found!")
-        print("\nTo create it:")
-        print("1. Start backend: cd backend && uv run python run.py")
-        print("2. Visit: http://localhost:8000/salesforce/login")
-        print("3. Authorize your Salesforce account")
-        return
-    
+    # Load users from the OAuth store
     try:
         data = load_oauth_data()
         users = data.get("users", [])
         
         if not users:
-            print("\n❌ No users found in oauth.json")
+            print("\n❌ No users found in the OAuth store")
+            print("\nTo add one:")
+            print("1. Start backend: cd backend && uv run python run.py")
+            print("2. Visit: http://localhost:8000/salesforce/login")
+            print("3. Authorize your Salesforce account")
             return
         
         # Use first user with Salesforce credentials
@@ -50,18 +50,9 @@ def test_salesforce_mcp_tools():
     print("TESTING SALESFORCE MCP TOOLS (Direct Calls)")
     print("=" * 70)
     
-    # Load oauth.json to get user_id
-    oauth_path = Path(__file__).parent.parent / "my_app" / "server" / "oauth.json"
-    
-    if not oauth_path.exists():
-        print("\n❌ Error: oauth.json not found!")
-        print("\nAuthenticate first:")
-        print("1. Start backend: cd backend && uv run python run.py")
-        print("2. Visit: http://localhost:8000/salesforce/login")
-        return
-    
-    with open(oauth_path, "r") as f:
-        data = json.load(f)
+    # Load users from the OAuth store to get user_id
+    from my_app.server.salesforce_utils import load_oauth_data
+    data = load_oauth_data()
     
     # Find user with Salesforce credentials
     sf_user = None
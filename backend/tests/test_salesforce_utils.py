@@ -0,0 +1,161 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from my_app.server import salesforce_utils
+from my_app.server.oauth_store import SQLiteOAuthStore
+
+
+class OAuthStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db_path = Path(self.tmpdir.name) / "oauth.db"
+        self.json_path = Path(self.tmpdir.name) / "oauth.json"
+        self.json_path.write_text(json.dumps({"users": [{"user_id": "u1", "services": {}}]}))
+
+    def test_imports_legacy_json_once(self):
+        store = SQLiteOAuthStore(self.db_path, self.json_path)
+        store.upsert_user({"user_id": "u1", "services": {"google": {}}})
+
+        reopened = SQLiteOAuthStore(self.db_path, self.json_path)
+
+        self.assertEqual(reopened.get_user("u1"), {"user_id": "u1", "services": {"google": {}}})
+
+    def test_upsert_user_touches_only_that_row(self):
+        store = SQLiteOAuthStore(self.db_path, self.json_path)
+        store.upsert_user({"user_id": "u2", "services": {}})
+
+        store.upsert_user({"user_id": "u2", "services": {"salesforce": {}}})
+
+        self.assertEqual(store.get_user("u1"), {"user_id": "u1", "services": {}})
+        self.assertEqual(len(store.list_users()), 2)
+
+
+class LoadSaveOAuthDataTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.db_path = Path(self.tmpdir.name) / "oauth.db"
+        json_path = Path(self.tmpdir.name) / "oauth.json"
+        json_path.write_text(json.dumps({"users": [{"user_id": "u1", "services": {}}]}))
+        self.store = SQLiteOAuthStore(self.db_path, json_path)
+
+        patches = [
+            mock.patch.object(salesforce_utils, "_use_s3", return_value=False),
+            mock.patch.object(salesforce_utils, "get_oauth_store", return_value=self.store),
+            mock.patch.dict(
+                salesforce_utils._oauth_cache,
+                {"version": None, "data": None, "index": {}, "key_index": {}},
+            ),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_load_reuses_data_until_another_connection_commits(self):
+        first = salesforce_utils.load_oauth_data()
+        second = salesforce_utils.load_oauth_data()
+
+        self.assertIs(first, second)
+
+        other = sqlite3.connect(self.db_path)
+        other.execute("DELETE FROM users")
+        other.commit()
+        other.close()
+
+        third = salesforce_utils.load_oauth_data()
+        self.assertIsNot(first, third)
+        self.assertEqual(third, {"users": []})
+
+    def test_save_oauth_user_persists_mutation(self):
+        data = salesforce_utils.load_oauth_data()
+        user = salesforce_utils.get_user("u1", data)
+        user["services"]["salesforce"] = {"credentials": {}}
+
+        salesforce_utils.save_oauth_user(data, user)
+
+        self.assertIs(salesforce_utils.load_oauth_data(), data)
+        self.assertIn("salesforce", self.store.get_user("u1")["services"])
+
+    def test_save_oauth_data_updates_cache(self):
+        salesforce_utils.load_oauth_data()
+        data = {"users": [{"user_id": "u1", "services": {}}, {"user_id": "u2", "services": {}}]}
+
+        salesforce_utils.save_oauth_data(data)
+
+        self.assertIs(salesforce_utils.load_oauth_data(), data)
+        self.assertIsNotNone(self.store.get_user("u2"))
+
+    def test_save_oauth_data_deletes_users_missing_from_data(self):
+        self.store.upsert_user({"user_id": "u2", "services": {}})
+
+        salesforce_utils.save_oauth_data({"users": [{"user_id": "u2", "services": {}}]})
+
+        self.assertIsNone(self.store.get_user("u1"))
+        self.assertEqual([u["user_id"] for u in self.store.list_users()], ["u2"])
+        self.assertIsNone(salesforce_utils.get_user("u1", salesforce_utils.load_oauth_data()))
+
+    def test_save_oauth_user_adds_new_user_to_cache(self):
+        data = salesforce_utils.load_oauth_data()
+        user = {"user_id": "u2", "services": {}, "api_key": {"key_hash": "h2"}}
+        data["users"].append(user)
+
+        salesforce_utils.save_oauth_user(data, user)
+
+        self.assertIs(salesforce_utils.get_user("u2"), user)
+        self.assertIs(salesforce_utils.get_user_by_key_hash("h2"), user)
+
+    def test_save_oauth_user_from_other_data_refreshes_cache(self):
+        cached = salesforce_utils.load_oauth_data()
+        other = {"users": [{"user_id": "u1", "services": {"google": {}}}]}
+
+        salesforce_utils.save_oauth_user(other, other["users"][0])
+
+        reloaded = salesforce_utils.load_oauth_data()
+        self.assertIsNot(reloaded, cached)
+        self.assertEqual(salesforce_utils.get_user("u1", reloaded)["services"], {"google": {}})
+
+    def test_load_normalizes_salesforce_issued_at(self):
+        self.store.upsert_user({
+            "user_id": "u2",
+            "services": {"salesforce": {"credentials": {"issued_at": "1700000000000"}}},
+        })
+
+        data = salesforce_utils.load_oauth_data()
+
+        creds = salesforce_utils.get_user("u2", data)["services"]["salesforce"]["credentials"]
+        self.assertEqual(creds["issued_at"], 1700000000000)
+
+    def test_get_user_returns_entry_from_loaded_data(self):
+        data = salesforce_utils.load_oauth_data()
+
+        user = salesforce_utils.get_user("u1", data)
+
+        self.assertIs(user, data["users"][0])
+        self.assertIsNone(salesforce_utils.get_user("missing", data))
+
+    def test_get_user_by_key_hash_ignores_replaced_keys(self):
+        self.store.upsert_user({"user_id": "u2", "api_key": {"key_hash": "old"}})
+        data = salesforce_utils.load_oauth_data()
+        user = salesforce_utils.get_user("u2", data)
+
+        self.assertIs(salesforce_utils.get_user_by_key_hash("old", data), user)
+
+        user["api_key"] = {"key_hash": "new"}
+        salesforce_utils.save_oauth_user(data, user)
+
+        self.assertIsNone(salesforce_utils.get_user_by_key_hash("old", data))
+        self.assertIs(salesforce_utils.get_user_by_key_hash("new", data), user)
+
+    def test_get_user_scans_uncached_data(self):
+        data = {"users": [{"user_id": "u2"}]}
+
+        self.assertIs(salesforce_utils.get_user("u2", data), data["users"][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
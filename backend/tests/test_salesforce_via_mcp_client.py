@@ -74,18 +74,8 @@ async def test_salesforce_mcp_via_client():
     print("TESTING SALESFORCE MCP TOOLS (Via MCP Client)")
     print("=" * 70)
     
-    # Check if oauth.json exists
-    oauth_path = Path(__file__).parent.parent / "my_app" / "server" / "oauth.json"
-    if not oauth_path.exists():
-        print("\n❌ oauth.json not found!")
-        print("\nSteps to authenticate:")
-        print("1. Start backend: cd backend && uv run python run.py")
-        print("2. Visit: http://localhost:8000/salesforce/login")
-        print("3. Authorize Salesforce")
-        return
-    
-    with open(oauth_path, "r") as f:
-        data = json.load(f)
+    from my_app.server.salesforce_utils import load_oauth_data
+    data = load_oauth_data()
     
     # Check for Salesforce credentials
     has_sf = any(
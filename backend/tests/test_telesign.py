@@ -1,37 +1,183 @@
 ﻿"""
 Test file for Telesign SMS functionality using the Enterprise SDK
+
+Usage:
+  python -m tests.test_telesign
+  python -m tests.test_telesign --plan plan.yaml --concurrency 8
+
+A plan is a YAML (or JSON) list of operations, run concurrently with one
+JSON result line per operation on stdout:
+  - {op: sms, phone: "+16027395506", message: "hi"}
+  - {op: phoneid, phone: "+16027395506"}
+  - {op: risk, phone: "+16027395506", lifecycle_event: sign-in}
+  - {op: otp, phone: "+16027395506"}
 """
 
+import argparse
+import asyncio
+import json
 import os
+import random
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
 from dotenv import load_dotenv
+from my_app.server import telesign_auth
 from my_app.server.telesign_auth import (
     send_sms,
+    send_sms_async,
+    send_verification_code_async,
     verify_phone_number,
+    verify_phone_number_async,
     get_message_status,
     get_messaging_client,
+    get_phoneid_client,
+    get_score_client,
+    get_verify_client,
     send_verification_code,
     verify_code,
-    assess_phone_risk  
+    assess_phone_risk
 )
 
-print("=" * 60)
-print("TELESIGN SMS TEST SUITE")
-print("=" * 60)
+try:
+    import yaml
+except ImportError:
+    yaml = None
 
 load_dotenv()
 
+_NON_DIGIT = re.compile(r"\D")
+
+
+RULE = "=" * 60
+
+
+def print_header(title: str):
+    """Print a test's title between two rules in a single write"""
+    print(f"\n{RULE}\n{title}\n{RULE}")
+
+
+# Reference IDs of sent messages, kept across runs so status checks can pick one.
+# Stored in the temp directory, not next to this script, so nothing lands in the repo.
+REFS_PATH = Path(tempfile.gettempdir()) / "securiva_telesign_refs.json"
+REFS_KEEP = 50
+_refs_lock = threading.Lock()
+
+
+def _load_refs() -> list:
+    try:
+        with open(REFS_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_ref(reference_id: str, phone: str, kind: str):
+    """Remember a sent message's reference ID"""
+    with _refs_lock:
+        refs = [ref for ref in _load_refs() if ref[0] != reference_id]
+        refs.append([reference_id, phone, kind, time.time()])
+        tmp_path = REFS_PATH.with_name(REFS_PATH.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(refs[-REFS_KEEP:], f)
+            os.replace(tmp_path, REFS_PATH)
+        except OSError as e:
+            print(f"⚠️  Could not save reference ID: {e}")
+
+
+def recent_refs(limit: int = 10) -> list:
+    """(id, phone, kind, ts) of the most recently sent messages, newest first"""
+    refs = sorted(_load_refs(), key=lambda ref: ref[3], reverse=True)
+    return [tuple(ref) for ref in refs[:limit]]
+
+
+# (label, result key, default) rows printed for a successful call
+PHONEID_FIELDS = (
+    ("Phone Type", "phone_type", "Unknown"),
+    ("Carrier", "carrier", "Unknown"),
+    ("Country", "country", "Unknown"),
+    ("State", "state", "Unknown"),
+    ("City", "city", "Unknown"),
+)
+SMS_FIELDS = (
+    ("Reference ID", "reference_id", None),
+    ("Status", "status", None),
+)
+VERIFICATION_FIELDS = (
+    ("Reference ID", "reference_id", None),
+    ("Generated Code (for testing)", "verify_code", None),
+)
+RISK_FIELDS = (
+    ("Reference ID", "reference_id", "N/A"),
+    ("Risk Level", "risk_level", "Unknown"),
+    ("Risk Score (0-1000 scale)", "risk_score", "N/A"),
+    ("Recommendation", "recommendation", "Unknown"),
+    ("Phone Type", "phone_type", "Unknown"),
+    ("Carrier", "carrier", "Unknown"),
+    ("Lifecycle Event", "account_lifecycle_event", "N/A"),
+)
+ERROR_FIELD = ("Error", "error", "Unknown error")
+ERRORS_FIELD = ("Errors", "errors", [])
+
+
+def _report(result: dict, success: str, fields: tuple = (), error_field: tuple = ERROR_FIELD) -> bool:
+    """
+    Print a telesign_auth result: on status 200 the success line and each
+    field row, otherwise the status code and error_field (if any).
+    
+    Returns:
+        bool: Whether the call succeeded
+    """
+    if result['status_code'] == 200:
+        print(f"✅ SUCCESS: {success}")
+        for label, key, default in fields:
+            print(f"   {label}: {result.get(key, default)}")
+        return True
+    
+    print(f"⚠️  Status Code: {result['status_code']}")
+    if error_field:
+        label, key, default = error_field
+        print(f"   {label}: {result.get(key, default)}")
+    return False
+
+
+def _report_failure(action: str, error: Exception):
+    print(f"❌ FAILED: {action}")
+    print(f"   Error: {error}")
+
+
+def warm_up(get_client):
+    """
+    Open a connection on an SDK client's session in the background while the
+    user is still answering prompts, so the test's request skips the TCP+TLS
+    handshake. Failures are ignored; the real request reports them.
+    """
+    def _run():
+        try:
+            client = get_client()
+            client.session.head(client.api_host, timeout=5, allow_redirects=False)
+        except Exception:
+            pass
+    
+    threading.Thread(target=_run, daemon=True).start()
+
+
 # Helper function to format phone numbers
 def format_phone_number(phone: str) -> str:
     """
-    Format phone number by removing + prefix for trial accounts
+    Format phone number by removing the + prefix (for trial accounts) and
+    any spaces, dashes or brackets
     
     Args:
         phone: Phone number with or without + prefix
     
     Returns:
-        str: Phone number without + prefix
+        str: Digits only
     """
-    return phone.lstrip('+')
+    return _NON_DIGIT.sub("", phone)
 
 
 def get_phone_input(prompt: str = "Enter phone number", allow_skip: bool = True) -> str | None:
@@ -47,18 +193,17 @@ def get_phone_input(prompt: str = "Enter phone number", allow_skip: bool = True)
     """
     print(f"\n{prompt}")
     print("  Format: E.164 format (e.g., +16027395506 or 16027395506)")
-    print("  Note: The + prefix will be automatically removed for trial accounts")
+    print("  Note: The + prefix, spaces and dashes will be automatically removed")
     if allow_skip:
         print("  Press Enter to skip this test")
     
-    phone = input("Phone number: ").strip()
-    
-    if not phone and allow_skip:
-        return None
-    
-    if not phone:
+    while True:
+        phone = input("Phone number: ").strip()
+        if phone:
+            break
+        if allow_skip:
+            return None
         print("❌ Phone number is required!")
-        return get_phone_input(prompt, allow_skip)
     
     # Format the phone number
     formatted = format_phone_number(phone)
@@ -76,8 +221,7 @@ def confirm_action(action: str) -> bool:
     Returns:
         bool: True if user confirms, False otherwise
     """
-    response = input(f"\n{action}? (yes/no): ").strip().lower()
-    return response in ['yes', 'y']
+    return input(f"\n{action}? (yes/no): ").strip().lower() in {"yes", "y"}
 
 
 def get_lifecycle_event() -> str:
@@ -111,9 +255,7 @@ def get_lifecycle_event() -> str:
 
 # ===== Test 1: Verify Credentials =====
 def test_credentials():
-    print("\n" + "=" * 60)
-    print("TEST 1: Verify Credentials")
-    print("=" * 60)
+    print_header("TEST 1: Verify Credentials")
     print("This test checks if your Telesign API credentials are valid.")
     
     try:
@@ -129,10 +271,9 @@ def test_credentials():
 
 
 # ===== Test 2: Phone Number Verification =====
-def test_phone_verification():
-    print("\n" + "=" * 60)
-    print("TEST 2: Phone Number Verification (PhoneID)")
-    print("=" * 60)
+def _prompt_phone_verification():
+    print_header("TEST 2: Phone Number Verification (PhoneID)")
+    warm_up(get_phoneid_client)
     print("This test retrieves detailed information about a phone number:")
     print("  • Phone type (mobile, landline, VoIP, etc.)")
     print("  • Carrier/operator name")
@@ -142,34 +283,35 @@ def test_phone_verification():
     
     if not phone:
         print("⚠️  Test skipped")
+        return None
+    return (phone,)
+
+
+def _report_phone_verification(result):
+    if isinstance(result, Exception):
+        _report_failure("Verification error", result)
+    elif not _report(result, "Phone verification complete", PHONEID_FIELDS):
+        if 'trial account' in str(result.get('error', '')).lower():
+            print(f"   → Add this number to your Telesign test numbers list")
+
+
+def test_phone_verification():
+    args = _prompt_phone_verification()
+    if not args:
         return
     
+    print("\n🔄 Verifying phone number...")
     try:
-        print("\n🔄 Verifying phone number...")
-        result = verify_phone_number(phone)
-        
-        if result['status_code'] == 200:
-            print(f"✅ SUCCESS: Phone verification complete")
-            print(f"   Phone Type: {result.get('phone_type', 'Unknown')}")
-            print(f"   Carrier: {result.get('carrier', 'Unknown')}")
-            print(f"   Country: {result.get('country', 'Unknown')}")
-            print(f"   State: {result.get('state', 'Unknown')}")
-            print(f"   City: {result.get('city', 'Unknown')}")
-        else:
-            print(f"⚠️  Status Code: {result['status_code']}")
-            print(f"   Error: {result.get('error', 'Unknown error')}")
-            if 'trial account' in str(result.get('error', '')).lower():
-                print(f"   → Add this number to your Telesign test numbers list")
+        result = verify_phone_number(*args)
     except Exception as e:
-        print(f"❌ FAILED: Verification error")
-        print(f"   Error: {e}")
+        result = e
+    _report_phone_verification(result)
 
 
 # ===== Test 3: Send SMS =====
-def test_send_sms():
-    print("\n" + "=" * 60)
-    print("TEST 3: Send SMS Message")
-    print("=" * 60)
+def _prompt_send_sms():
+    print_header("TEST 3: Send SMS Message")
+    warm_up(get_messaging_client)
     print("This test sends a standard SMS text message.")
     
     phone = get_phone_input("Enter destination phone number for SMS")
@@ -188,38 +330,76 @@ def test_send_sms():
     if not confirm_action(f"Send SMS to {phone}"):
         print("❌ Test cancelled")
         return None
+    return (phone, message)
+
+
+def _report_send_sms(result):
+    """Print the send result; returns the reference ID on success"""
+    if isinstance(result, Exception):
+        _report_failure("Could not send SMS", result)
+        return None
+    
+    if _report(result, "SMS sent", SMS_FIELDS, ERRORS_FIELD):
+        print(f"   → Save this Reference ID to check delivery status later")
+        return result['reference_id']
+    return None
+
+
+def test_send_sms():
+    args = _prompt_send_sms()
+    if not args:
+        return None
     
+    print("\n🔄 Sending SMS...")
     try:
-        print("\n🔄 Sending SMS...")
-        result = send_sms(phone, message)
-        
-        if result['status_code'] == 200:
-            print(f"✅ SUCCESS: SMS sent")
-            print(f"   Reference ID: {result['reference_id']}")
-            print(f"   Status: {result['status']}")
-            print(f"   → Save this Reference ID to check delivery status later")
-            return result['reference_id']
-        else:
-            print(f"⚠️  Status Code: {result['status_code']}")
-            print(f"   Errors: {result.get('errors', [])}")
-            return None
+        result = send_sms(*args)
     except Exception as e:
-        print(f"❌ FAILED: Could not send SMS")
-        print(f"   Error: {e}")
-        return None
+        result = e
+    ref_id = _report_send_sms(result)
+    if ref_id:
+        save_ref(ref_id, args[0], "sms")
+    return ref_id
 
 
 # ===== Test 4: Check Message Status =====
+# A status check right after sending usually sees "in progress", so re-check a
+# few times, waiting STATUS_POLL_BASE * 2**n seconds, until delivered or failed
+STATUS_POLL_TRIES = 4
+STATUS_POLL_BASE = 0.5  # seconds
+
+
+def _poll_message_status(reference_id: str) -> dict:
+    for attempt in range(STATUS_POLL_TRIES):
+        result = get_message_status(reference_id)
+        status = result.get('status')
+        code = status.get('code') if isinstance(status, dict) else None
+        if result['status_code'] != 200 or not code or code == 200 or code >= 400:
+            break
+        if attempt < STATUS_POLL_TRIES - 1:
+            delay = STATUS_POLL_BASE * 2 ** attempt
+            print(f"   … still in progress (code {code}), checking again in {delay:g}s")
+            time.sleep(delay)
+    return result
+
+
 def test_message_status(reference_id: str = None):
-    print("\n" + "=" * 60)
-    print("TEST 4: Check Message Delivery Status")
-    print("=" * 60)
+    print_header("TEST 4: Check Message Delivery Status")
     print("This test checks the delivery status of a previously sent message.")
     
     if not reference_id:
-        print("\nEnter the Reference ID from a previous message:")
+        refs = recent_refs()
+        if refs:
+            print("\nRecently sent:")
+            for i, (ref, phone, kind, ts) in enumerate(refs, 1):
+                sent_at = time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))
+                print(f"  {i}. {ref}  ({kind} to {phone}, {sent_at})")
+            print("\nEnter the Reference ID from a previous message, or its number above:")
+        else:
+            print("\nEnter the Reference ID from a previous message:")
         print("  (Press Enter to skip)")
         reference_id = input("Reference ID: ").strip()
+        if reference_id.isdigit() and 1 <= int(reference_id) <= len(refs):
+            reference_id = refs[int(reference_id) - 1][0]
     
     if not reference_id:
         print("⚠️  Test skipped")
@@ -227,11 +407,9 @@ def test_message_status(reference_id: str = None):
     
     try:
         print("\n🔄 Checking message status...")
-        result = get_message_status(reference_id)
+        result = _poll_message_status(reference_id)
         
-        if result['status_code'] == 200:
-            print(f"✅ SUCCESS: Status retrieved")
-            print(f"   Status: {result['status']}")
+        if _report(result, "Status retrieved", (("Status", "status", None),), error_field=None):
             status_code = result['status'].get('code') if isinstance(result['status'], dict) else None
             if status_code:
                 print(f"   Status Code: {status_code}")
@@ -241,18 +419,14 @@ def test_message_status(reference_id: str = None):
                     print(f"   → Message delivered")
                 elif status_code >= 400:
                     print(f"   → Message failed")
-        else:
-            print(f"⚠️  Status Code: {result['status_code']}")
     except Exception as e:
-        print(f"❌ FAILED: Could not retrieve status")
-        print(f"   Error: {e}")
+        _report_failure("Could not retrieve status", e)
 
 
 # ===== Test 5: Send 2FA Verification Code =====
 def test_send_verification_code():
-    print("\n" + "=" * 60)
-    print("TEST 5: Send 2FA Verification Code")
-    print("=" * 60)
+    print_header("TEST 5: Send 2FA Verification Code")
+    warm_up(get_verify_client)
     print("This test sends a verification code for two-factor authentication.")
     print("Telesign will automatically generate and send the code.")
     
@@ -270,31 +444,22 @@ def test_send_verification_code():
         print("\n🔄 Sending verification code...")
         result = send_verification_code(phone)
         
-        if result['status_code'] == 200:
-            print(f"✅ SUCCESS: Verification code sent")
-            print(f"   Reference ID: {result['reference_id']}")
-            print(f"   Generated Code: {result['verify_code']} (for testing)")
+        if _report(result, "Verification code sent", VERIFICATION_FIELDS, ERRORS_FIELD):
             print(f"   → The recipient should receive this code via SMS")
             print(f"   → Use Test 6 to verify the code they received")
             return {
                 'reference_id': result['reference_id'],
                 'verify_code': result['verify_code']
             }
-        else:
-            print(f"⚠️  Status Code: {result['status_code']}")
-            print(f"   Errors: {result.get('errors', [])}")
-            return None
+        return None
     except Exception as e:
-        print(f"❌ FAILED: Could not send verification code")
-        print(f"   Error: {e}")
+        _report_failure("Could not send verification code", e)
         return None
 
 
 # ===== Test 6: Verify 2FA Code =====
 def test_verify_code(verification_data: dict = None):
-    print("\n" + "=" * 60)
-    print("TEST 6: Verify 2FA Code")
-    print("=" * 60)
+    print_header("TEST 6: Verify 2FA Code")
     print("This test verifies a code entered by the user.")
     
     reference_id = None
@@ -337,15 +502,47 @@ def test_verify_code(verification_data: dict = None):
             print(f"⚠️  Status Code: {result['status_code']}")
             print(f"   Message: {result.get('message', 'Unknown error')}")
     except Exception as e:
-        print(f"❌ FAILED: Could not verify code")
-        print(f"   Error: {e}")
+        _report_failure("Could not verify code", e)
 
 
 # ===== Test 7: Assess Phone Risk =====
-def test_assess_risk():
-    print("\n" + "=" * 60)
-    print("TEST 7: Assess Phone Number Risk (Intelligence/Score API)")
-    print("=" * 60)
+# Risk results for the same number and lifecycle event are reused within a
+# session. Client errors (e.g. trial-account limits) are kept only briefly,
+# and throttling/server errors not at all, so they can be retried.
+RISK_CACHE_TTL = 6 * 3600  # seconds
+RISK_ERROR_TTL = 60  # seconds
+_risk_cache: dict = {}
+
+
+def _assess_risk_cached(phone: str, lifecycle_event: str) -> dict:
+    key = (phone, lifecycle_event)
+    cached = _risk_cache.get(key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    
+    result = assess_phone_risk(phone, lifecycle_event)
+    status = result.get('status_code')
+    if status == 200:
+        _risk_cache[key] = (result, time.monotonic() + RISK_CACHE_TTL)
+    elif status and 400 <= status < 500 and status != 429:
+        _risk_cache[key] = (result, time.monotonic() + RISK_ERROR_TTL)
+    return result
+
+
+async def _assess_risk_cached_async(phone: str, lifecycle_event: str) -> dict:
+    return await asyncio.to_thread(_assess_risk_cached, phone, lifecycle_event)
+
+
+def clear_lookup_caches():
+    """Forget cached risk results and telesign_auth's cached PhoneID lookups"""
+    _risk_cache.clear()
+    telesign_auth._phoneid_cache.clear()
+    print("✅ Cached PhoneID and risk lookups cleared")
+
+
+def _prompt_assess_risk():
+    print_header("TEST 7: Assess Phone Number Risk (Intelligence/Score API)")
+    warm_up(get_score_client)
     print("This test performs fraud risk assessment using Telesign Intelligence.")
     print("Useful for detecting suspicious registrations or transactions.")
     
@@ -353,45 +550,244 @@ def test_assess_risk():
     
     if not phone:
         print("⚠️  Test skipped")
-        return
+        return None
     
     # Get lifecycle event
     lifecycle_event = get_lifecycle_event()
+    return (phone, lifecycle_event)
+
+
+def _report_assess_risk(result):
+    if isinstance(result, Exception):
+        _report_failure("Risk assessment error", result)
+        return
     
+    if _report(result, "Risk assessment complete", RISK_FIELDS):
+        # Explain recommendation
+        recommendation = result.get('recommendation', '').lower()
+        if recommendation == 'allow':
+            print(f"   → Low risk - safe to proceed")
+        elif recommendation == 'flag':
+            print(f"   → Medium risk - additional verification recommended")
+        elif recommendation == 'block':
+            print(f"   → High risk - consider blocking")
+    elif 'trial account' in str(result.get('error', '')).lower():
+        print(f"   → Risk assessment may require a production account")
+
+
+def test_assess_risk():
+    args = _prompt_assess_risk()
+    if not args:
+        return
+    
+    print(f"\n🔄 Assessing phone risk (lifecycle: {args[1]})...")
     try:
-        print(f"\n🔄 Assessing phone risk (lifecycle: {lifecycle_event})...")
-        result = assess_phone_risk(phone, lifecycle_event)
+        result = _assess_risk_cached(*args)
+    except Exception as e:
+        result = e
+    _report_assess_risk(result)
+
+
+# ===== Batch: All SMS Tests =====
+# Batch calls in flight at once, and the API statuses worth retrying
+BATCH_CONCURRENCY = int(os.getenv("TELESIGN_CONCURRENCY", "8"))
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# A 5xx after a send may mean the SMS went out anyway, so sends only retry rate limits
+SEND_RETRY_STATUSES = frozenset({429})
+
+
+async def _with_retry(call, *args, tries: int = 4, base: float = 0.5,
+                      retry_on: frozenset = RETRY_STATUSES) -> dict:
+    """Await call(*args), retrying with jittered exponential backoff on retry_on statuses"""
+    for attempt in range(tries):
+        result = await call(*args)
+        if result.get('status_code') not in retry_on or attempt == tries - 1:
+            return result
+        await asyncio.sleep(base * 2 ** attempt + random.random() * base)
+
+
+def run_all_sms_tests():
+    """
+    Collect the input for every SMS test first, then make the independent
+    API calls concurrently instead of one round-trip after another
+    """
+    jobs = [
+        (verify_phone_number_async, _prompt_phone_verification(), _report_phone_verification, RETRY_STATUSES),
+        (send_sms_async, _prompt_send_sms(), _report_send_sms, SEND_RETRY_STATUSES),
+        (_assess_risk_cached_async, _prompt_assess_risk(), _report_assess_risk, RETRY_STATUSES),
+    ]
+    jobs = [job for job in jobs if job[1]]
+    if not jobs:
+        return
+    
+    async def _run():
+        sem = asyncio.Semaphore(BATCH_CONCURRENCY)
         
-        if result['status_code'] == 200:
-            print(f"✅ SUCCESS: Risk assessment complete")
-            print(f"   Reference ID: {result.get('reference_id', 'N/A')}")
-            print(f"   Risk Level: {result.get('risk_level', 'Unknown')}")
-            print(f"   Risk Score: {result.get('risk_score', 'N/A')} (0-1000 scale)")
-            print(f"   Recommendation: {result.get('recommendation', 'Unknown')}")
-            print(f"   Phone Type: {result.get('phone_type', 'Unknown')}")
-            print(f"   Carrier: {result.get('carrier', 'Unknown')}")
-            print(f"   Lifecycle Event: {result.get('account_lifecycle_event', 'N/A')}")
-            
-            # Explain recommendation
-            recommendation = result.get('recommendation', '').lower()
-            if recommendation == 'allow':
-                print(f"   → Low risk - safe to proceed")
-            elif recommendation == 'flag':
-                print(f"   → Medium risk - additional verification recommended")
-            elif recommendation == 'block':
-                print(f"   → High risk - consider blocking")
+        async def _one(call, args, retry_on):
+            async with sem:
+                return await _with_retry(call, *args, retry_on=retry_on)
+        
+        return await asyncio.gather(*(_one(call, args, retry_on) for call, args, _, retry_on in jobs),
+                                    return_exceptions=True)
+    
+    print(f"\n🔄 Running {len(jobs)} tests concurrently...")
+    results = asyncio.run(_run())
+    
+    ref_id = None
+    for (_, args, report, _), result in zip(jobs, results):
+        print()
+        if report is _report_send_sms:
+            ref_id = report(result)
+            if ref_id:
+                save_ref(ref_id, args[0], "sms")
         else:
-            print(f"⚠️  Status Code: {result['status_code']}")
-            print(f"   Error: {result.get('error', 'Unknown error')}")
-            if 'trial account' in str(result.get('error', '')).lower():
-                print(f"   → Risk assessment may require a production account")
-    except Exception as e:
-        print(f"❌ FAILED: Risk assessment error")
-        print(f"   Error: {e}")
+            report(result)
+    
+    if ref_id:
+        test_message_status(ref_id)
+
+
+# ===== Scripted Test Plans =====
+DEFAULT_SMS_MESSAGE = "Hello from Securiva! This is a test SMS message."
+
+# op -> (async call, builds its args from a plan item, statuses worth retrying)
+PLAN_OPS = {
+    "sms": (send_sms_async, lambda item: (item.get("message", DEFAULT_SMS_MESSAGE),), SEND_RETRY_STATUSES),
+    "phoneid": (verify_phone_number_async, lambda item: (), RETRY_STATUSES),
+    "risk": (_assess_risk_cached_async,
+             lambda item: (item.get("lifecycle_event", "create"),),
+             RETRY_STATUSES),
+    "otp": (send_verification_code_async, lambda item: (), SEND_RETRY_STATUSES),
+}
+
+
+def load_plan(path: str) -> list:
+    """Read a plan file: YAML if PyYAML is installed, otherwise JSON"""
+    with open(path, "r") as f:
+        plan = yaml.safe_load(f) if yaml is not None else json.load(f)
+    if not isinstance(plan, list):
+        raise ValueError(f"{path}: a plan must be a list of operations")
+    return plan
+
+
+async def _run_plan_item(index: int, item: dict, sem: asyncio.Semaphore) -> bool:
+    """Run one plan operation and print its result as a JSON line"""
+    op = item.get("op") if isinstance(item, dict) else None
+    phone = format_phone_number(str(item.get("phone", ""))) if op else ""
+    if op not in PLAN_OPS or not phone:
+        result = {"status_code": None, "error": f"invalid plan item: {item!r}"}
+    else:
+        call, build_args, retry_on = PLAN_OPS[op]
+        try:
+            async with sem:
+                result = await _with_retry(call, phone, *build_args(item), retry_on=retry_on)
+        except Exception as e:
+            result = {"status_code": None, "error": str(e)}
+        if op == "sms" and result.get("status_code") == 200:
+            save_ref(result["reference_id"], phone, "sms")
+    
+    print(json.dumps({"index": index, "op": op, "phone": phone, **result}, default=str), flush=True)
+    return result.get("status_code") == 200
+
+
+def run_plan(path: str, concurrency: int = BATCH_CONCURRENCY, batch_size: int = 100) -> int:
+    """
+    Run every operation in a plan file, at most `concurrency` requests in flight
+    and `batch_size` operations scheduled at a time
+    
+    Returns:
+        int: Exit code; 0 if every operation returned status 200
+    """
+    plan = load_plan(path)
+    
+    async def _run():
+        sem = asyncio.Semaphore(concurrency)
+        ok = True
+        for start in range(0, len(plan), batch_size):
+            slab = plan[start:start + batch_size]
+            results = await asyncio.gather(
+                *(_run_plan_item(start + i, item, sem) for i, item in enumerate(slab))
+            )
+            ok = ok and all(results)
+        return ok
+    
+    return 0 if asyncio.run(_run()) else 1
+
+
+# ===== Menu Actions =====
+def _sms_then_status():
+    ref_id = test_send_sms()
+    if ref_id and confirm_action("Check message status now"):
+        test_message_status(ref_id)
+
+
+def _code_then_verify():
+    verification_data = test_send_verification_code()
+    if verification_data and confirm_action("Verify code now"):
+        test_verify_code(verification_data)
+
+
+def _run_all_sms():
+    print("\n🔄 Running all SMS tests...")
+    run_all_sms_tests()
+
+
+def _run_2fa_workflow():
+    print("\n🔄 Running complete 2FA workflow...")
+    print("This simulates a real 2FA authentication flow:")
+    print("  1. Send verification code to user's phone")
+    print("  2. User enters the code they received")
+    print("  3. Verify the code matches\n")
+    
+    verification_data = test_send_verification_code()
+    if verification_data:
+        test_verify_code(verification_data)
+
+
+def _invalid_choice():
+    print("❌ Invalid choice. Please enter a number from the menu.")
+
+
+MENU = "\n".join([
+    "",
+    RULE,
+    "TELESIGN SMS TEST MENU",
+    RULE,
+    "Available Tests:",
+    "  1. Verify phone number (PhoneID)",
+    "  2. Send SMS message",
+    "  3. Check message delivery status",
+    "  4. Send 2FA verification code",
+    "  5. Verify 2FA code",
+    "  6. Assess phone fraud risk (Intelligence)",
+    "\nBatch Tests:",
+    "  7. Run all SMS tests",
+    "  8. Run complete 2FA workflow",
+    "\n  9. Clear cached PhoneID/risk lookups",
+    "\n  0. Exit",
+    RULE,
+    "\n💡 TIP: Test 8 demonstrates a complete 2FA implementation!",
+])
+
+# Menu choice -> action; "0" (exit) is handled by the loop itself
+MENU_ACTIONS = {
+    "1": test_phone_verification,
+    "2": _sms_then_status,
+    "3": test_message_status,
+    "4": _code_then_verify,
+    "5": test_verify_code,
+    "6": test_assess_risk,
+    "7": _run_all_sms,
+    "8": _run_2fa_workflow,
+    "9": clear_lookup_caches,
+}
 
 
 # ===== Main Test Runner =====
 def main():
+    print("=" * 60)
+    print("TELESIGN SMS TEST SUITE")
+    print("=" * 60)
     print("\nWelcome to the Telesign SMS Test Suite!")
     print("This interactive tool helps you test Telesign SMS features.\n")
     print("⚠️  Note: WhatsApp features require WhatsApp Business API access.")
@@ -406,77 +802,44 @@ def main():
     
     # Interactive test menu
     while True:
-        print("\n" + "=" * 60)
-        print("TELESIGN SMS TEST MENU")
-        print("=" * 60)
-        print("Available Tests:")
-        print("  1. Verify phone number (PhoneID)")
-        print("  2. Send SMS message")
-        print("  3. Check message delivery status")
-        print("  4. Send 2FA verification code")
-        print("  5. Verify 2FA code")
-        print("  6. Assess phone fraud risk (Intelligence)")
-        print("\nBatch Tests:")
-        print("  7. Run all SMS tests")
-        print("  8. Run complete 2FA workflow")
-        print("\n  0. Exit")
-        print("=" * 60)
-        print("\n💡 TIP: Test 8 demonstrates a complete 2FA implementation!")
+        print(MENU)
         
         choice = input("\nEnter choice: ").strip()
         
-        if choice == "1":
-            test_phone_verification()
-        
-        elif choice == "2":
-            ref_id = test_send_sms()
-            if ref_id and confirm_action("Check message status now"):
-                test_message_status(ref_id)
-        
-        elif choice == "3":
-            test_message_status()
-        
-        elif choice == "4":
-            verification_data = test_send_verification_code()
-            if verification_data and confirm_action("Verify code now"):
-                test_verify_code(verification_data)
-        
-        elif choice == "5":
-            test_verify_code()
-        
-        elif choice == "6":
-            test_assess_risk()
-        
-        elif choice == "7":
-            print("\n🔄 Running all SMS tests...")
-            test_phone_verification()
-            ref_id = test_send_sms()
-            if ref_id:
-                test_message_status(ref_id)
-            test_assess_risk()
-        
-        elif choice == "8":
-            print("\n🔄 Running complete 2FA workflow...")
-            print("This simulates a real 2FA authentication flow:")
-            print("  1. Send verification code to user's phone")
-            print("  2. User enters the code they received")
-            print("  3. Verify the code matches\n")
-            
-            verification_data = test_send_verification_code()
-            if verification_data:
-                test_verify_code(verification_data)
-        
-        elif choice == "0":
+        if choice == "0":
             print("\n👋 Thank you for using Telesign SMS Test Suite!")
             print("\n💡 Want WhatsApp? Contact Telesign to upgrade your account:")
             print("   https://portal.telesign.com")
             break
         
-        else:
-            print("❌ Invalid choice. Please enter a number from the menu.")
+        MENU_ACTIONS.get(choice, _invalid_choice)()
     
     input("\nPress Enter to exit...")
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Telesign SMS test suite (interactive, or a scripted test plan)")
+    parser.add_argument(
+        "--plan",
+        help="YAML/JSON list of operations to run non-interactively",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=BATCH_CONCURRENCY,
+        help="Maximum plan requests in flight at once",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=100,
+        help="Plan operations scheduled at a time",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.plan:
+        raise SystemExit(run_plan(args.plan, args.concurrency, args.batch))
     main()
\ No newline at end of file
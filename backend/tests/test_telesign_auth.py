@@ -0,0 +1,289 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from my_app.server import telesign_auth
+
+
+class _Response:
+    def __init__(self, status_code=200, json=None):
+        self.status_code = status_code
+        self.json = json if json is not None else {}
+        self.body = ""
+
+
+class PhoneIdCacheTests(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.dict(telesign_auth._phoneid_cache, clear=True),
+            mock.patch.object(telesign_auth, "log_tool_call"),
+            mock.patch.object(telesign_auth, "get_phoneid_client"),
+        ]
+        self.log_tool_call = patches[1].start()
+        self.client = patches[2].start().return_value
+        patches[0].start()
+        for patcher in patches:
+            self.addCleanup(patcher.stop)
+        self.client.phoneid.return_value = _Response(json={
+            "reference_id": "ref1",
+            "carrier": {"name": "Carrier"},
+        })
+
+    def test_repeat_lookup_is_served_from_cache(self):
+        first = telesign_auth.verify_phone_number("+15555550100")
+        second = telesign_auth.verify_phone_number("15555550100")
+
+        self.client.phoneid.assert_called_once()
+        self.assertEqual(first, second)
+        self.assertEqual(second["carrier"], "Carrier")
+
+    def test_cache_hit_returns_a_copy(self):
+        first = telesign_auth.verify_phone_number("15555550100")
+        first["carrier"] = "changed"
+        first["contact_info"]["email"] = "changed"
+
+        second = telesign_auth.verify_phone_number("15555550100")
+        second["carrier"] = "changed again"
+
+        third = telesign_auth.verify_phone_number("15555550100")
+        self.assertEqual(third["carrier"], "Carrier")
+        self.assertEqual(third["contact_info"]["email"], "")
+
+    def test_cache_hit_is_logged_as_cached(self):
+        telesign_auth.verify_phone_number("15555550100")
+        self.log_tool_call.reset_mock()
+
+        telesign_auth.verify_phone_number("15555550100")
+
+        self.log_tool_call.assert_called_once()
+        kwargs = self.log_tool_call.call_args.kwargs
+        self.assertEqual(kwargs["tool_name"], "verify_phone_number")
+        self.assertTrue(kwargs["metadata"]["cached"])
+        self.assertEqual(kwargs["metadata"]["reference_id"], "ref1")
+
+    def test_expired_entry_is_looked_up_again(self):
+        ttl = telesign_auth.PHONEID_CACHE_TTL
+        with mock.patch.object(telesign_auth.time, "monotonic", side_effect=[0, ttl, ttl]):
+            telesign_auth.verify_phone_number("15555550100")
+            telesign_auth.verify_phone_number("15555550100")
+
+        self.assertEqual(self.client.phoneid.call_count, 2)
+
+    def test_verbose_is_cached_separately(self):
+        telesign_auth.verify_phone_number("15555550100")
+        verbose = telesign_auth.verify_phone_number("15555550100", verbose=True)
+
+        self.assertEqual(self.client.phoneid.call_count, 2)
+        self.assertIn("full_response", verbose)
+
+    def test_failed_lookup_is_not_cached(self):
+        self.client.phoneid.return_value = _Response(status_code=400)
+
+        telesign_auth.verify_phone_number("15555550100")
+        telesign_auth.verify_phone_number("15555550100")
+
+        self.assertEqual(self.client.phoneid.call_count, 2)
+
+
+class PhoneIdCacheEvictionTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(telesign_auth._phoneid_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(telesign_auth, "PHONEID_CACHE_MAX", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_full_cache_drops_expired_entries_first(self):
+        ttl = telesign_auth.PHONEID_CACHE_TTL
+        with mock.patch.object(telesign_auth.time, "monotonic", side_effect=[0, ttl - 1, ttl]):
+            telesign_auth._cache_phoneid(("old", False), {"n": 1})
+            telesign_auth._cache_phoneid(("live", False), {"n": 2})
+            telesign_auth._cache_phoneid(("new", False), {"n": 3})
+
+        self.assertEqual(set(telesign_auth._phoneid_cache), {("live", False), ("new", False)})
+
+    def test_sweep_and_insert_hold_the_lock(self):
+        lock = telesign_auth._phoneid_cache_lock
+        seen = []
+
+        class _Cache(dict):
+            def items(self):
+                seen.append(("sweep", lock.locked()))
+                return super().items()
+
+            def __setitem__(self, key, value):
+                seen.append(("insert", lock.locked()))
+                super().__setitem__(key, value)
+
+        with mock.patch.object(telesign_auth, "_phoneid_cache", _Cache()), \
+                mock.patch.object(telesign_auth.time, "monotonic", return_value=0):
+            telesign_auth._cache_phoneid(("a", False), {"n": 1})
+            telesign_auth._cache_phoneid(("b", False), {"n": 2})
+            telesign_auth._cache_phoneid(("c", False), {"n": 3})
+
+        self.assertIn(("sweep", True), seen)
+        self.assertTrue(all(locked for _, locked in seen))
+
+    def test_full_cache_of_live_entries_is_cleared(self):
+        with mock.patch.object(telesign_auth.time, "monotonic", return_value=0):
+            telesign_auth._cache_phoneid(("a", False), {"n": 1})
+            telesign_auth._cache_phoneid(("b", False), {"n": 2})
+            telesign_auth._cache_phoneid(("c", False), {"n": 3})
+
+        self.assertEqual(set(telesign_auth._phoneid_cache), {("c", False)})
+
+
+class OtpStoreTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(telesign_auth._otp_store, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_correct_code_is_valid_once(self):
+        telesign_auth._store_otp("ref1", "12345")
+
+        self.assertTrue(telesign_auth.verify_otp_by_ref("ref1", " 12345 ")["valid"])
+        second = telesign_auth.verify_otp_by_ref("ref1", "12345")
+        self.assertFalse(second["valid"])
+        self.assertEqual(second["status_code"], 400)
+
+    def test_wrong_attempt_uses_up_the_code(self):
+        telesign_auth._store_otp("ref1", "12345")
+
+        wrong = telesign_auth.verify_otp_by_ref("ref1", "00000")
+        retry = telesign_auth.verify_otp_by_ref("ref1", "12345")
+
+        self.assertEqual((wrong["status_code"], wrong["valid"]), (200, False))
+        self.assertEqual((retry["status_code"], retry["valid"]), (400, False))
+
+    def test_expired_code_is_rejected(self):
+        with mock.patch.object(telesign_auth.time, "monotonic", side_effect=[0, telesign_auth.OTP_TTL]):
+            telesign_auth._store_otp("ref1", "12345")
+            result = telesign_auth.verify_otp_by_ref("ref1", "12345")
+
+        self.assertFalse(result["valid"])
+        self.assertEqual(result["status_code"], 400)
+
+    def test_unknown_ref_is_rejected(self):
+        result = telesign_auth.verify_otp_by_ref("missing", "12345")
+
+        self.assertEqual(result, {
+            "status_code": 400,
+            "valid": False,
+            "message": "Verification code expired or not found",
+            "reference_id": "missing",
+        })
+
+    def test_storing_purges_expired_codes(self):
+        with mock.patch.object(telesign_auth.time, "monotonic", side_effect=[0, telesign_auth.OTP_TTL]):
+            telesign_auth._store_otp("old", "1")
+            telesign_auth._store_otp("new", "2")
+
+        self.assertEqual(set(telesign_auth._otp_store), {"new"})
+
+    def test_verify_code_falls_back_to_stored_code(self):
+        telesign_auth._store_otp("ref1", "12345")
+
+        self.assertTrue(telesign_auth.verify_code("ref1", "12345")["valid"])
+        self.assertFalse(telesign_auth.verify_code("ref1", "12345")["valid"])
+
+    def test_verify_code_with_original_code_skips_the_store(self):
+        self.assertTrue(telesign_auth.verify_code("ref1", "12345", original_code=12345)["valid"])
+        self.assertFalse(telesign_auth.verify_code("ref1", "1234", original_code="12345")["valid"])
+
+
+class OtpQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch.dict(telesign_auth._otp_results, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.send = mock.AsyncMock(return_value={"success": True, "reference_id": "ref1"})
+        patcher = mock.patch.object(telesign_auth, "send_verification_code_async", self.send)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        telesign_auth.start_otp_workers()
+
+    async def asyncTearDown(self):
+        await telesign_auth.stop_otp_workers()
+
+    async def test_queued_send_result_is_picked_up_once(self):
+        tracking_id = await telesign_auth.queue_verification_code("15555550100", 6)
+        await telesign_auth._otp_queue.join()
+
+        self.assertEqual(telesign_auth.get_queued_verification(tracking_id), {"success": True, "reference_id": "ref1"})
+        self.assertIsNone(telesign_auth.get_queued_verification(tracking_id))
+        self.send.assert_awaited_once_with("15555550100", 6)
+
+    async def test_failed_send_is_reported_as_result(self):
+        self.send.side_effect = RuntimeError("boom")
+
+        tracking_id = await telesign_auth.queue_verification_code("15555550100")
+        await telesign_auth._otp_queue.join()
+
+        self.assertEqual(
+            telesign_auth.get_queued_verification(tracking_id),
+            {"status_code": 500, "success": False, "error": "boom"},
+        )
+
+    async def test_unknown_tracking_id(self):
+        self.assertIsNone(telesign_auth.get_queued_verification("missing"))
+
+    async def test_stop_cancels_workers_and_rejects_new_sends(self):
+        workers = list(telesign_auth._otp_workers)
+
+        await telesign_auth.stop_otp_workers()
+
+        self.assertTrue(all(task.cancelled() for task in workers))
+        self.assertEqual(telesign_auth._otp_workers, [])
+        with self.assertRaises(RuntimeError):
+            await telesign_auth.queue_verification_code("15555550100")
+
+
+class BoundedGatherTests(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_at_most_concurrency_calls_at_once(self):
+        running = peak = 0
+
+        async def call(phone):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            return phone
+
+        results = await telesign_auth._gather_bounded(call, [str(i) for i in range(10)], concurrency=3)
+
+        self.assertEqual(results, [str(i) for i in range(10)])
+        self.assertEqual(peak, 3)
+
+    async def test_exceptions_stay_in_their_slot(self):
+        error = ValueError("bad number")
+
+        async def call(phone, message):
+            await asyncio.sleep(0)
+            if phone == "2":
+                raise error
+            return {"to": phone, "message": message}
+
+        results = await telesign_auth._gather_bounded(call, ["1", "2", "3"], "hi", return_exceptions=True)
+
+        self.assertEqual(results, [{"to": "1", "message": "hi"}, error, {"to": "3", "message": "hi"}])
+
+    async def test_send_bulk_sms_returns_failures_in_place(self):
+        error = RuntimeError("timeout")
+
+        async def send(phone, message):
+            if phone == "2":
+                raise error
+            return {"success": True, "to": phone}
+
+        with mock.patch.object(telesign_auth, "send_sms_async", side_effect=send) as send_sms_async:
+            results = await telesign_auth.send_bulk_sms(["1", "2", "3"], "hello", concurrency=2)
+
+        self.assertEqual(results, [{"success": True, "to": "1"}, error, {"success": True, "to": "3"}])
+        send_sms_async.assert_any_await("2", "hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from unittest import mock
+
+from my_app.server import telesign_whatsapp
+from my_app.server.telesign_whatsapp import WhatsAppMediaType
+
+
+class SendWhatsAppMediaTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(telesign_whatsapp, "WHATSAPP_PREMIUM_ENABLED", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(telesign_whatsapp, "get_whatsapp_client")
+        self.client = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.client.message.return_value = mock.Mock(status_code=200, json={"reference_id": "ref1"})
+
+    def test_premium_gate_comes_first(self):
+        with mock.patch.object(telesign_whatsapp, "WHATSAPP_PREMIUM_ENABLED", False):
+            result = telesign_whatsapp.send_whatsapp_media("+16025551234", "https://x/a.png", "not a media type")
+
+        self.assertEqual(result["status_code"], 403)
+
+    def test_invalid_media_type_returns_error_dict(self):
+        result = telesign_whatsapp.send_whatsapp_media("+16025551234", "https://x/a.png", "image")
+
+        self.assertEqual(result["status_code"], 500)
+        self.assertEqual(result["message_type"], "image")
+        self.assertIn("error", result)
+        self.client.message.assert_not_called()
+
+    def test_sends_media_payload(self):
+        result = telesign_whatsapp.send_whatsapp_media(
+            "+16025551234", "https://x/a.png", WhatsAppMediaType.IMAGE, caption="Hi", filename="ignored.png"
+        )
+
+        self.assertEqual(result["reference_id"], "ref1")
+        self.assertEqual(result["message_type"], "image")
+        kwargs = self.client.message.call_args.kwargs
+        self.assertEqual(kwargs["type"], "image")
+        self.assertEqual(kwargs["image"], {"link": "https://x/a.png", "caption": "Hi"})
+
+
+if __name__ == "__main__":
+    unittest.main()
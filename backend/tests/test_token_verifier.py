@@ -0,0 +1,62 @@
+import asyncio
+import os
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+import jwt
+
+from my_app.server import token_verifier
+
+
+def _token(exp_offset=300, **claims):
+    payload = {"client_id": "c1", "sub": "u1", "exp": int(time.time()) + exp_offset, **claims}
+    return jwt.encode(payload, token_verifier.JWT_SECRET_KEY, algorithm="HS256")
+
+
+class TokenCacheTests(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.dict(token_verifier._token_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.verifier = token_verifier.SimpleTokenVerifier()
+
+    def verify(self, token):
+        return asyncio.run(self.verifier.verify_token(token))
+
+    def test_repeat_token_skips_decode(self):
+        token = _token()
+        with mock.patch.object(
+            token_verifier._JWT_DECODER, "decode", wraps=token_verifier._JWT_DECODER.decode
+        ) as decode:
+            first = self.verify(token)
+            second = self.verify(token)
+
+        decode.assert_called_once()
+        self.assertEqual((second.client_id, second.subject), (first.client_id, first.subject))
+
+    def test_invalid_token_is_not_cached(self):
+        token = _token() + "x"
+
+        self.assertIsNone(self.verify(token))
+        self.assertNotIn(token, token_verifier._token_cache)
+
+    def test_cached_token_is_rejected_after_exp(self):
+        token = _token()
+        self.verify(token)
+
+        with mock.patch.object(token_verifier.time, "time", return_value=time.time() + 301), \
+                mock.patch.object(
+                    token_verifier._JWT_DECODER, "decode", side_effect=jwt.ExpiredSignatureError
+                ) as decode:
+            self.assertIsNone(self.verify(token))
+
+        decode.assert_called_once()
+
+        self.assertNotIn(token, token_verifier._token_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
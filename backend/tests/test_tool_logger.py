@@ -0,0 +1,344 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from my_app.server.tool_logger import (
+    ToolCallLogger,
+    _BatchedFileHandler,
+    _JsonLinesHandler,
+    _LogWriter,
+    _compress_executor,
+    _uninstall_handlers,
+    zstandard,
+)
+
+
+class _BlockingHandler(logging.Handler):
+    """Collects records, but only once `unblock` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.unblock.wait()
+        self.records.append(record)
+
+
+class ToolLoggerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.logger = ToolCallLogger(log_dir=self.tmpdir.name)
+        self.addCleanup(_uninstall_handlers, self.tmpdir.name)
+
+
+class DedupTests(ToolLoggerTestCase):
+    def test_result_entry_after_start_entry_is_kept(self):
+        args = {"phone_number": "15555550100"}
+        self.logger.log_tool_call("background", "verify_phone_number", args)
+        self.logger.log_tool_call("background", "verify_phone_number", args, result={"status_code": 200})
+
+        logs = self.logger.get_recent_logs()
+
+        self.assertEqual(len(logs), 2)
+        self.assertEqual(logs[0]["result"], "{'status_code': 200}")
+        self.assertNotIn("result", logs[1])
+
+    def test_identical_entries_are_collapsed(self):
+        for _ in range(3):
+            self.logger.log_tool_call("s1", "lookup", {"q": 1}, result="ok")
+
+        logs = self.logger.get_recent_logs()
+
+        self.assertEqual(len(logs), 1)
+
+    def test_repeat_count_carried_by_next_logged_entry(self):
+        for _ in range(3):
+            self.logger.log_tool_call("s1", "lookup", {"q": 1}, result="ok")
+        # Let the dedup window lapse
+        for seen in self.logger._recent_calls.values():
+            seen[0] -= self.logger.DEDUP_WINDOW
+        self.logger.log_tool_call("s1", "lookup", {"q": 1}, result="ok")
+
+        logs = self.logger.get_recent_logs()
+
+        self.assertEqual(len(logs), 2)
+        self.assertEqual(logs[0]["repeat_count"], 2)
+
+    def test_different_metadata_is_not_collapsed(self):
+        self.logger.log_tool_call("s1", "send_sms", {"to": "1"}, metadata={"attempt": 1})
+        self.logger.log_tool_call("s1", "send_sms", {"to": "1"}, metadata={"attempt": 2})
+
+        self.assertEqual(len(self.logger.get_recent_logs()), 2)
+
+
+class JsonLinesHandlerTestCase(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = Path(tmpdir.name) / "tool_calls.json"
+
+    def make_handler(self, max_bytes=1 << 20):
+        handler = _JsonLinesHandler(self.path, max_bytes=max_bytes)
+        self.addCleanup(handler.close)
+        return handler
+
+    def write(self, handler, *entries):
+        for entry in entries:
+            handler.handle(logging.makeLogRecord({"levelno": logging.INFO, "json_payload": entry}))
+        handler.flush()
+
+    def read_ranges(self, ranges):
+        with open(self.path, "rb") as f:
+            return [json.loads(os.pread(f.fileno(), length, offset)) for offset, length in ranges]
+
+
+class SessionIndexTests(JsonLinesHandlerTestCase):
+    def test_session_entries_found_through_index(self):
+        handler = self.make_handler()
+        self.write(handler, {"session_id": "a", "n": 1}, {"session_id": "b", "n": 2}, {"session_id": "a", "n": 3})
+
+        entries = self.read_ranges(handler.session_ranges("a"))
+
+        self.assertEqual([entry["n"] for entry in entries], [1, 3])
+        self.assertEqual(handler.session_ranges("missing"), [])
+
+    def test_missing_index_is_rebuilt_from_log(self):
+        self.write(self.make_handler(), {"session_id": "a", "n": 1}, {"session_id": "b", "n": 2})
+        self.path.with_suffix(".idx").unlink()
+
+        entries = self.read_ranges(self.make_handler().session_ranges("b"))
+
+        self.assertEqual([entry["n"] for entry in entries], [2])
+
+    def test_sees_entries_written_by_another_handler(self):
+        reader = self.make_handler()
+        self.write(self.make_handler(), {"session_id": "a", "n": 1})
+
+        entries = self.read_ranges(reader.session_ranges("a"))
+
+        self.assertEqual([entry["n"] for entry in entries], [1])
+
+    def test_get_session_logs(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        logger = ToolCallLogger(log_dir=tmpdir.name)
+        self.addCleanup(_uninstall_handlers, tmpdir.name)
+        logger.log_tool_call("a", "lookup", {"q": 1}, result="one")
+        logger.log_tool_call("b", "lookup", {"q": 2}, result="two")
+        logger.log_tool_call("a", "lookup", {"q": 3}, result="three")
+
+        self.assertEqual([entry["result"] for entry in logger.get_session_logs("a")], ["one", "three"])
+
+
+class RotationTests(JsonLinesHandlerTestCase):
+    def wait_for_compression(self):
+        _compress_executor.submit(lambda: None).result(timeout=10)
+
+    def read_segment(self, number):
+        segment = self.path.with_name(f"{self.path.name}.{number}")
+        if zstandard is not None:
+            with open(segment.with_name(segment.name + ".zst"), "rb") as f:
+                data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        else:
+            with gzip.open(segment.with_name(segment.name + ".gz"), "rb") as f:
+                data = f.read()
+        return [json.loads(line) for line in data.splitlines()]
+
+    def test_rotates_and_compresses_past_max_bytes(self):
+        handler = self.make_handler(max_bytes=60)
+        self.write(handler, {"session_id": "a", "n": 1}, {"session_id": "a", "n": 2}, {"session_id": "a", "n": 3})
+        self.write(handler, {"session_id": "a", "n": 4})
+        self.wait_for_compression()
+
+        self.assertEqual([entry["n"] for entry in self.read_segment(1)], [1, 2, 3])
+        self.assertFalse(self.path.with_name("tool_calls.json.1").exists())
+        # The new segment and its index start empty
+        self.assertEqual([entry["n"] for entry in self.read_ranges(handler.session_ranges("a"))], [4])
+
+    def test_segments_are_numbered_in_order(self):
+        handler = self.make_handler(max_bytes=10)
+        self.write(handler, {"session_id": "a", "n": 1})
+        self.write(handler, {"session_id": "a", "n": 2})
+        self.wait_for_compression()
+
+        self.assertEqual(self.read_segment(1), [{"session_id": "a", "n": 1}])
+        self.assertEqual(self.read_segment(2), [{"session_id": "a", "n": 2}])
+        self.assertEqual(self.path.stat().st_size, 0)
+
+    def test_follows_rotation_by_another_handler(self):
+        reader = self.make_handler()
+        self.write(reader, {"session_id": "a", "n": 1})
+        self.write(self.make_handler(max_bytes=10), {"session_id": "a", "n": 2})
+        self.write(reader, {"session_id": "a", "n": 3})
+
+        entries = self.read_ranges(reader.session_ranges("a"))
+
+        self.assertEqual([entry["n"] for entry in entries], [3])
+
+
+class SamplingTests(unittest.TestCase):
+    def make_logger(self, rate):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        with mock.patch.dict("os.environ", {"TOOL_LOG_SAMPLE": rate}):
+            logger = ToolCallLogger(log_dir=tmpdir.name)
+        self.addCleanup(_uninstall_handlers, tmpdir.name)
+        return logger
+
+    def test_skipped_successes_are_counted_not_logged(self):
+        logger = self.make_logger("0.5")
+        with mock.patch("my_app.server.tool_logger.random.random", side_effect=[0.9, 0.1, 0.7]):
+            logger.log_tool_call("s1", "lookup", {"q": 1}, result="a")
+            logger.log_tool_call("s1", "lookup", {"q": 2}, result="b")
+            logger.log_tool_call("s1", "send_sms", {"to": "1"}, result="c")
+
+        logs = logger.get_recent_logs()
+
+        self.assertEqual([entry["result"] for entry in logs], ["b"])
+        self.assertEqual(logger.stats()["sampled_out"], {"lookup": 1, "send_sms": 1})
+        self.assertNotIn("sampled_out", [entry["tool_name"] for entry in logs])
+
+    def test_errors_are_always_logged(self):
+        logger = self.make_logger("0")
+        logger.log_tool_call("s1", "lookup", {"q": 1}, result="ok")
+        logger.log_tool_call("s1", "lookup", {"q": 1}, error="boom")
+
+        logs = logger.get_recent_logs()
+
+        self.assertEqual([entry["error"] for entry in logs], ["boom"])
+        self.assertEqual(logger.stats()["sampled_out"], {"lookup": 1})
+
+    def test_invalid_rate_logs_everything(self):
+        logger = self.make_logger("lots")
+
+        self.assertEqual(logger.stats()["sample_rate"], 1.0)
+
+
+class ReadTests(ToolLoggerTestCase):
+    def test_reads_do_not_wait_on_a_stuck_writer(self):
+        self.logger.log_tool_call("s1", "lookup", {"q": 1}, result="ok")
+        self.assertTrue(self.logger.flush())
+
+        handler = _BlockingHandler()
+        stuck = _LogWriter([handler])
+        self.addCleanup(stuck.stop)
+        self.addCleanup(handler.unblock.set)
+        stuck.put(logging.makeLogRecord({"levelno": logging.INFO}))
+        self.logger._writer = stuck
+
+        started = time.monotonic()
+        recent = self.logger.get_recent_logs()
+        session = self.logger.get_session_logs("s1")
+
+        self.assertLess(time.monotonic() - started, 3 * self.logger.READ_FLUSH_TIMEOUT)
+        self.assertEqual(len(recent), 1)
+        self.assertEqual(len(session), 1)
+
+
+class LogWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.handler = _BlockingHandler()
+        self.writer = _LogWriter([self.handler], maxsize=2)
+        self.addCleanup(self.writer.stop)
+        self.addCleanup(self.handler.unblock.set)
+
+    def record(self, msg="m"):
+        return logging.makeLogRecord({"levelno": logging.INFO, "msg": msg})
+
+    def test_writes_queued_records_in_order(self):
+        handler = _BlockingHandler()
+        writer = _LogWriter([handler])
+        self.addCleanup(writer.stop)
+        for i in range(5):
+            writer.put(self.record(str(i)))
+        handler.unblock.set()
+
+        self.assertTrue(writer.flush(timeout=2))
+        self.assertEqual([r.msg for r in handler.records], ["0", "1", "2", "3", "4"])
+
+    def test_full_queue_drops_and_counts_records(self):
+        # The first record is taken off the queue and blocks in the handler
+        self.writer.put(self.record())
+        while self.writer._queue.qsize():
+            pass
+        results = [self.writer.put(self.record()) for _ in range(4)]
+
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(self.writer.dropped, 2)
+
+    def test_flush_gives_up_after_timeout(self):
+        self.writer.put(self.record())
+
+        self.assertFalse(self.writer.flush(timeout=0.05))
+
+        self.handler.unblock.set()
+        self.assertTrue(self.writer.flush(timeout=2))
+
+    def test_stop_is_idempotent_and_flush_returns_once_stopped(self):
+        self.handler.unblock.set()
+        self.writer.stop()
+        self.writer.stop()
+
+        self.writer.put(self.record())
+        self.assertFalse(self.writer.flush(timeout=None))
+
+    def test_stop_closes_handlers_once(self):
+        self.handler.unblock.set()
+        with mock.patch.object(self.handler, "close") as close:
+            self.writer.stop()
+            self.writer.stop()
+
+        close.assert_called_once_with()
+
+    def test_only_handlers_that_took_a_record_are_flushed(self):
+        self.handler.unblock.set()
+        idle = _BlockingHandler()
+        idle.setLevel(logging.WARNING)
+        writer = _LogWriter([self.handler, idle])
+        self.addCleanup(writer.stop)
+
+        with mock.patch.object(self.handler, "flush") as busy_flush, \
+                mock.patch.object(idle, "flush") as idle_flush:
+            writer.put(self.record())
+            self.assertTrue(writer.flush(timeout=2))
+
+        busy_flush.assert_called()
+        idle_flush.assert_not_called()
+
+
+class HandlerCloseTests(JsonLinesHandlerTestCase):
+    def test_file_handlers_can_be_closed_twice(self):
+        text_handler = _BatchedFileHandler(self.path.with_name("tool_calls.log"))
+        json_handler = _JsonLinesHandler(self.path)
+
+        for handler in (text_handler, json_handler, text_handler, json_handler):
+            handler.close()
+
+        self.assertIsNone(text_handler._fd)
+        self.assertIsNone(json_handler._fd)
+        self.assertIsNone(json_handler._index_fd)
+
+    def test_uninstall_stops_the_pipeline(self):
+        logger = ToolCallLogger(log_dir=self.path.parent)
+        writer = logger._writer
+
+        _uninstall_handlers(self.path.parent)
+        _uninstall_handlers(self.path.parent)
+
+        self.assertFalse(writer._thread.is_alive())
+        self.assertIsNot(ToolCallLogger(log_dir=self.path.parent)._writer, writer)
+        _uninstall_handlers(self.path.parent)
+
+
+if __name__ == "__main__":
+    unittest.main()